@@ -0,0 +1,335 @@
+"""
+This Python file benchmarks text cleaning rules on the existing scrapped corpus (output/corpus.jsonl)
+and on raw scrapped paragraphs of the raw page archive (raw_archive), and compares the current
+implementation with the previous one: the phrase table applied with str.replace on every call and
+sentence rules re-tokenising the sentence with re.search for every rule.
+"""
+
+# Import modules and packages
+import os
+import re
+import time
+import statistics
+from bs4 import BeautifulSoup
+
+from utils.corpus_store import CorpusStore
+from utils.raw_archive import RawPageArchive
+from utils.preprocess_text import (
+    PHRASES_TO_REPLACE,
+    TEXT_NORMALISER,
+    preprocess_sentence,
+    preprocess_sentences,
+    clean_paragprah_text,
+    clean_paragprah_texts,
+)
+
+def replace_phrases_naive(text: str) -> str:
+    """
+    Previous implementation: rebuild the phrase table and run one str.replace pass per phrase
+    """
+    phrases_to_remove: dict = dict(PHRASES_TO_REPLACE)
+    for this_key in phrases_to_remove.keys():
+        text: str = text.replace(this_key, phrases_to_remove.get(this_key))
+
+    return text
+
+
+def preprocess_sentence_naive(sentence: str) -> str:
+    """
+    Previous implementation, copied verbatim from the version before the rules were precompiled:
+    split the sentence into tokens and run re.search on every token for every rule
+    """
+    # Handle cases: "e.9"
+    d: dict = {}
+    for this_token in sentence.split(' '):
+        if re.search(r'[^1-9][.]\d+', this_token):
+            temp_seq: list = this_token.split('.')
+            fixed_seq: str = f'{temp_seq[0]}. {temp_seq[1]}'
+            d[this_token] = fixed_seq
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: 9Self-service
+    d: dict = {}
+    pattern_digit: str = r'\d+'
+    pattern_word: str = r'[a-zA-Z]'
+
+    for this_token in sentence.split(' '):
+        if re.search(r'\d+[a-zA-Z]', this_token):
+            temp_seq: str = re.search(r'\d+[a-zA-Z]', this_token).group()
+            digit: str = re.search(pattern_digit, temp_seq).group()
+            word: str = re.search(pattern_word, temp_seq).group()
+            fixed_seq: str = f'{digit} {word}'
+            d[temp_seq] = fixed_seq
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: benefitsQuitting
+    d: dict = {}
+    pattern_cap: str = r'[A-Z]'
+    pattern_non_cap: str = r'[a-z]'
+
+    for this_token in sentence.split(' '):
+        if re.search(r'[a-z][A-Z]', this_token):
+            temp_seq: str = re.search(r'[a-z][A-Z]', this_token).group()
+            non_cap_char: str = re.search(pattern_non_cap, temp_seq).group()
+            cap_char: str = re.search(pattern_cap, temp_seq).group()
+
+            fixed_seq: str = f'{non_cap_char} {cap_char}'
+            d[temp_seq] = fixed_seq
+
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: prohibited.Underage
+    d: dict = {}
+
+    for this_token in sentence.split(' '):
+        if re.search(r'[a-z][.][A-Z]', this_token):
+            temp_seq: str = re.search(r'[a-z][.][A-Z]', this_token).group()
+            non_cap_char: str = re.search(pattern_non_cap, temp_seq).group()
+            cap_char: str = re.search(pattern_cap, temp_seq).group()
+            fixed_seq: str = f'{non_cap_char}. {cap_char}'
+            d[temp_seq] = fixed_seq
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: while?Artem
+    d: dict = {}
+    for this_token in sentence.split(' '):
+        if re.search(r'[a-zA-Z]+[?][a-zA-Z]+', this_token):
+            temp_seq: str = re.search(r'[a-zA-Z]+[?][a-zA-Z]+', this_token).group()
+            word_1, word_2 = temp_seq.split('?')
+            fixed_seq: str = f'{word_1}? {word_2}'
+            d[temp_seq] = fixed_seq
+
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: go!Today
+    d: dict = {}
+    for this_token in sentence.split(' '):
+        if re.search(r'[a-zA-Z]+[!][a-zA-Z]+', this_token):
+            temp_seq: str = re.search(r'[a-zA-Z]+[!][a-zA-Z]+', this_token).group()
+            word_1, word_2 = temp_seq.split('!')
+            fixed_seq: str = f'{word_1}? {word_2}'
+            d[temp_seq] = fixed_seq
+
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: needed."Kirill:
+    d: dict = {}
+
+    for this_token in sentence.split(' '):
+        if re.search(r'[a-zA-Z]+[.][\"][a-zA-Z]+', this_token):
+            temp_seq: str = re.search(r'[a-zA-Z]+[.][\"][a-zA-Z]+', this_token).group()
+            word_1, word_2 = temp_seq.split('.')
+            fixed_seq: str = f'{word_1}. {word_2}'
+            d[temp_seq] = fixed_seq
+
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: 2019.3
+    d: dict = {}
+
+    for this_token in sentence.split(' '):
+        if re.search(r'[\d+]{4}[.][\d+]', this_token):
+            temp_seq: str = re.search(r'[\d+]{4}[.][\d+]', this_token).group()
+            digit_1, digit_2 = temp_seq.split('.')
+            fixed_seq: str = f'{digit_1}. {digit_2}'
+            d[temp_seq] = fixed_seq
+
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: podcast:Introducing
+    d: dict = {}
+
+    for this_token in sentence.split(' '):
+        if re.search(r'[a-zA-Z]+[:][a-zA-Z]+', this_token):
+            temp_seq: str = re.search(r'[a-zA-Z]+[:][a-zA-Z]+', this_token).group()
+            word_1, word_2 = temp_seq.split(':')
+            fixed_seq: str = f'{word_1}. {word_2}'
+            d[temp_seq] = fixed_seq
+
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    # Handle case: 200,000
+    d: dict = {}
+
+    for this_token in sentence.split(' '):
+        if re.search(r'\d+[,]\d+', this_token):
+            d[this_token] = ''.join(this_token.split(','))
+
+    for key, value in d.items():
+        sentence: str = sentence.replace(key, value)
+
+    return sentence
+
+
+def clean_paragprah_text_naive(paragraph_text: str) -> str:
+    """
+    Previous implementation of clean_paragprah_text: phrase table applied with str.replace and the
+    previous sentence rules
+    """
+    paragraph_text: str = paragraph_text.strip()
+    paragraph_text: str = replace_phrases_naive(text=paragraph_text)
+    paragraph_text: str = preprocess_sentence_naive(sentence=paragraph_text.replace('  ', ' '))
+
+    return " ".join(paragraph_text.split()).strip()
+
+
+def split_paragraphs(texts: list[str], sentences_per_paragraph: int = 5) -> list[list[str]]:
+    """
+    Split full text of every episode into paragraph-sized pieces
+    """
+    episodes: list[list[str]] = []
+    for this_text in texts:
+        sentences: list[str] = this_text.split(' . ')
+        episodes.append([
+            ' . '.join(sentences[i:i + sentences_per_paragraph])
+            for i in range(0, len(sentences), sentences_per_paragraph)
+        ])
+
+    return episodes
+
+
+def load_corpus_texts(path: str) -> list[str]:
+    """
+    Load full texts of all scrapped podcasts from the corpus
+    """
+    return [this_record['full_text'] for this_record in CorpusStore(path=path).iter_records()]
+
+
+def load_raw_paragraphs(archive_dir: str) -> list[list[str]]:
+    """
+    Load raw (not cleaned) paragraphs of every archived podcast page, picked the same way as in
+    PodcastCleaner.build_podcast_record: <p> tags if there are several of them, <div> tags otherwise
+    """
+    episodes: list[list[str]] = []
+    if not os.path.isdir(archive_dir):
+        return episodes
+
+    for raw_page in RawPageArchive(archive_dir=archive_dir).iter_pages():
+        if raw_page['html_text'] is None:
+            continue
+        html_text: BeautifulSoup = BeautifulSoup(raw_page['html_text'], 'html.parser')
+        tag: str = 'p' if len(html_text.find_all('p')) > 1 else 'div'
+        paragraphs: list[str] = [this_paragraph.text for this_paragraph in html_text.find_all(tag)]
+        if len(paragraphs) > 0:
+            episodes.append(paragraphs)
+
+    return episodes
+
+
+def time_per_episode(function, texts: list, repeats: int) -> list[float]:
+    """
+    Best of the given number of repeats of cleaning time (milliseconds) of every episode
+    """
+    timings: list[float] = []
+    for this_text in texts:
+        best: float = float('inf')
+        for _ in range(repeats):
+            started_at: float = time.perf_counter()
+            function(this_text)
+            best: float = min(best, time.perf_counter() - started_at)
+        timings.append(best * 1000)
+
+    return timings
+
+
+def print_timings(name: str, timings: list[float]) -> None:
+    """
+    Print summary of per-episode timings
+    """
+    print(
+        f'{name}: mean {statistics.mean(timings):.3f} ms, median {statistics.median(timings):.3f} ms, '
+        f'max {max(timings):.3f} ms, total {sum(timings):.1f} ms'
+    )
+
+    return None
+
+
+def benchmark_raw_paragraphs(archive_dir: str, repeats: int) -> None:
+    """
+    Print per-episode cleaning time of raw scrapped paragraphs (the path of the cleaning stage) before
+    and after
+    """
+    episodes: list[list[str]] = load_raw_paragraphs(archive_dir=archive_dir)
+    if len(episodes) == 0:
+        print(f'No archived raw pages found in {archive_dir}')
+        return None
+
+    mismatches: int = sum(
+        [clean_paragprah_text_naive(paragraph_text=this_paragraph) for this_paragraph in this_episode]
+        != clean_paragprah_texts(paragraph_texts=this_episode) for this_episode in episodes
+    )
+    print(f'Raw pages: {len(episodes)}, outputs different from the previous implementation: {mismatches}')
+
+    for name, function in (
+        ('before (clean_paragprah_text)', lambda episode: [clean_paragprah_text_naive(x) for x in episode]),
+        ('after (clean_paragprah_text)', lambda episode: [clean_paragprah_text(x) for x in episode]),
+        ('after (clean_paragprah_texts batch)', clean_paragprah_texts),
+    ):
+        timings: list[float] = time_per_episode(function=function, texts=episodes, repeats=repeats)
+        print_timings(name=name, timings=timings)
+
+    return None
+
+
+def main(path: str, archive_dir: str, repeats: int) -> None:
+    """
+    Run the benchmark and print per-episode cleaning time before and after
+    """
+    benchmark_raw_paragraphs(archive_dir=archive_dir, repeats=repeats)
+
+    texts: list[str] = load_corpus_texts(path=path)
+    if len(texts) == 0:
+        print(f'No scrapped podcasts found in {path}')
+        return None
+
+    mismatches: int = sum(
+        replace_phrases_naive(text=this_text) != TEXT_NORMALISER.normalise(text=this_text) for this_text in texts
+    )
+    print(f'Episodes: {len(texts)}, outputs different from the previous implementation: {mismatches}')
+
+    for name, function in (
+        ('before (str.replace per phrase)', replace_phrases_naive),
+        ('after (TextNormaliser)', TEXT_NORMALISER.normalise),
+    ):
+        timings: list[float] = time_per_episode(function=function, texts=texts, repeats=repeats)
+        print_timings(name=name, timings=timings)
+
+    episodes: list[list[str]] = split_paragraphs(texts=texts)
+    mismatches: int = sum(
+        [preprocess_sentence_naive(sentence=this_paragraph) for this_paragraph in this_episode]
+        != preprocess_sentences(sentences=this_episode) for this_episode in episodes
+    )
+    print(f'Sentence rules, outputs different from the previous implementation: {mismatches}')
+
+    for name, function in (
+        ('before (re.search per token and rule)', lambda episode: [preprocess_sentence_naive(x) for x in episode]),
+        ('after (preprocess_sentence)', lambda episode: [preprocess_sentence(x) for x in episode]),
+        ('after (preprocess_sentences batch)', preprocess_sentences),
+    ):
+        timings: list[float] = time_per_episode(function=function, texts=episodes, repeats=repeats)
+        print_timings(name=name, timings=timings)
+
+    return None
+
+
+if __name__ == '__main__':
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description='Text cleaning benchmark')
+    arg_parser.add_argument('--run', default=False, action='store_true')
+    arg_parser.add_argument('--path', default=os.path.join('output', 'corpus.jsonl'), help='Corpus with scrapped podcasts')
+    arg_parser.add_argument('--raw-archive', default='raw_archive', help='Raw page archive of the scrapper')
+    arg_parser.add_argument('--repeats', default=5, type=int, help='Repeats per episode, the best one is taken')
+    args = arg_parser.parse_args()
+
+    if args.run:
+        main(path=args.path, archive_dir=args.raw_archive, repeats=args.repeats)
@@ -1,29 +1,57 @@
 # Import modules and packages
 import pandas as pd
 import requests
+import os
 import json
 import time
 import logging
 import re
+import queue
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 
 # Import and use required excplicit functions and methods
 from utils.utils import (
     prepare_page_for_scrapping,
+    build_http_session,
     block_aggressively,
-    save_to_json,
+    block_aggressively_async,
     error_msg_load_page,
-    generate_scrapped_podcast_filename,
     parse_date,
     split_by_doubled_text
 )
 from utils.preprocess_text import (
     preprocess_sentence,
     clean_paragprah_text,
+    clean_paragprah_texts,
     remove_timestamps,
     fix_urls_definitions,
 )
+from utils.crawl_manifest import (
+    CrawlManifest,
+    get_content_hash,
+    STATUS_SCRAPPED,
+    STATUS_TEXT_NOT_FOUND,
+    STATUS_FAILED,
+    STATUS_FETCHED,
+    DeadLetterList,
+)
+from utils.catalogue_cache import CatalogueCache
+from utils.raw_archive import RawPageArchive
+from utils.corpus_store import CorpusStore
+from utils.retry_policy import (
+    RetryPolicy,
+    CircuitBreaker,
+    PageLoadError,
+    PermanentPageError,
+    check_response_status,
+    describe_error,
+    PERMANENT_HTTP_STATUSES,
+)
 
 
 # Initialize logger
@@ -36,6 +64,18 @@ logger = logging.getLogger(template_name)
 
 # System constants
 MAX_RETRIES: int = 30  # maximum number of retries to load the review section
+RETRY_TIME_BUDGET: float = 300.0  # maximum number of seconds spent on retries of a single URL
+FAILURE_THRESHOLD: int = 10  # failures in a row which pause the whole crawl
+CIRCUIT_COOLDOWN: float = 120.0  # seconds the crawl is paused for
+N_PAGES: int = 4  # number of browser pages scraping podcasts concurrently
+SLOW_MO: int = 0  # milliseconds Playwright waits between browser operations
+BACKENDS: tuple = ('sync', 'async')  # available scraping backends
+MANIFEST_PATH: str = 'crawl_manifest.jsonl'  # stored next to the output folder
+DEAD_LETTER_PATH: str = 'dead_letter.jsonl'  # failed URLs kept for a targeted re-run
+CATALOGUE_CACHE_DIR: str = 'cache'  # cached podcast URL catalogue
+RAW_ARCHIVE_DIR: str = 'raw_archive'  # compressed raw HTML of fetched podcast pages, input of the cleaning stage
+CORPUS_PATH: str = os.path.join('output', 'corpus.jsonl')  # all scrapped podcast records, one per line
+CLEAN_WORKERS: int = os.cpu_count() or 1  # number of processes of the cleaning stage
 API_URL: str = 'https://www.superdatascience.com/fc1c3a35f8202c72aa2adac93ce2a764927351ad.js'  # Can be changed by API provider
 MAIN_URL: str = 'https://www.superdatascience.com'
 payload: dict = {
@@ -46,33 +86,204 @@ possible_text_tags: list = [
     '.block-animation'
 ]
 
-class TextScrapper:
+class PodcastCleaner:
+    """Turn raw HTML sections of a fetched podcast page into the cleaned podcast record. The class holds
+    no state, so cleaning stage worker processes build their own instance."""
+
+    def handle_parapgraphs(self, all_text_sections: BeautifulSoup, tag: str) -> list:
+        """
+        Iterate through text paragrapsh whether they are based on <div> or <p> tags in the HTML code
+        """
+        l_text: list = []
+        paragraph_texts: list[str] = [this_paragraph.text for this_paragraph in all_text_sections.find_all(tag)]
+        for actual_text in clean_paragprah_texts(paragraph_texts=paragraph_texts):
+            if (len(actual_text) > 0) and (actual_text.upper() != 'Show all'.upper()):
+                l_text.append(actual_text)
+
+        return l_text
+
+    def _full_podcast_text_cleaning_heuristic(self, podcast_text: str) -> str:
+        """
+        Steps to implement overall full podcast text cleaning and preparation
+        """
+        podcast_text: str = remove_timestamps(podcast_text=podcast_text)
+        podcast_text: str = clean_paragprah_text(paragraph_text=podcast_text)
+        podcast_text: str = fix_urls_definitions(podcast_text=podcast_text)
+        podcast_text: str = split_by_doubled_text(podcast_text=podcast_text)
+
+        return podcast_text
+    
+    def build_podcast_record(self, i: int, record: dict, information_html: str, html_text: str) -> dict:
+        """
+        Parse fetched HTML sections of the podcast page and fill the given record with the cleaned text
+        and its metadata. Return None if the podcast text was not found.
+        """
+        if 'sds-' in record['url']:
+            page_title_: str = record['url'].split('sds-')[-1][4:]
+            podcast_number: str = re.search(r'[\w]{3}-[\d+]*', record['url']).group()
+            static_part, dynamic_part = podcast_number.split('-')
+            podcast_number: str = f'{static_part}-{str(int(dynamic_part)).zfill(4)}'
+        elif 'podcast-' in record['url']:
+            page_title_: str = record['url'].split('podcast-')[-1]
+            podcast_number: str = f'cus-{str(i+1).zfill(4)}'
+        elif '/podcast/' in record['url']:
+            page_title_: str = record['url'].split('/')[-1].strip()
+            podcast_number: str = f'cus-{str(i+1).zfill(4)}'
+
+        page_title: str = page_title_.split(f'{podcast_number}: ')[-1]
+        podcast_date: str = parse_date(
+            date_string=BeautifulSoup(
+                information_html, 'html.parser'
+                ) \
+                    .find_all('p')[-1].text) \
+                    .strip()
+
+        if html_text is None:
+            logger.info(f'Text not found for {record["url"]}')
+            return None
+
+        html_text_for_scrapping: BeautifulSoup = BeautifulSoup(html_text, 'html.parser')
+        l_text: list = []
+        if len(html_text_for_scrapping.find_all('p')) > 1:
+            l_text: list = self.handle_parapgraphs(all_text_sections=html_text_for_scrapping, tag='p')
+
+        elif len(html_text_for_scrapping.find_all('div')) > 0:
+            l_text: list = self.handle_parapgraphs(all_text_sections=html_text_for_scrapping, tag='div')
+
+        full_text: str = ' '.join(list(l_text))
+        full_text: str = self._full_podcast_text_cleaning_heuristic(podcast_text=full_text)
+
+        record['full_text'] = full_text
+        record['title'] = page_title
+        record['date'] = podcast_date
+        record['number'] = podcast_number
+        record['n_words'] = len(full_text.split(' '))
+        record['n_chars'] = len(full_text)
+        record['n_sentences'] = len(full_text.split('. '))
+        record['tokens_count'] = len(full_text) / 4  # 1 token = ~4 characters
+        # TODO: add timestamp of each podcast
+
+        return record
+
+
+# Podcast cleaner of a cleaning stage worker process (created by the process pool initializer)
+_cleaner: PodcastCleaner = None
+
+
+def _init_cleaning_worker() -> None:
+    """
+    Process pool initializer of the cleaning stage
+    """
+    global _cleaner
+    _cleaner = PodcastCleaner()
+
+    return None
+
+
+def _clean_raw_page(raw_page: dict) -> tuple:
+    """
+    Build the podcast record from the raw page in a cleaning stage worker process. Return URL, the record
+    (None if the podcast text was not found) and the error raised while cleaning (None if succeeded).
+    """
+    url: str = raw_page['record']['url']
+    try:
+        record: dict = _cleaner.build_podcast_record(
+            i=raw_page['position'],
+            record=dict(raw_page['record']),
+            information_html=raw_page['information_html'],
+            html_text=raw_page['html_text'],
+            )
+        return url, record, None
+    except Exception as e:
+        return url, None, e
+
+
+class TextScrapper(PodcastCleaner):
     """Run the scrapper by executing the following steps:
         - Collect all podcasts related URL links from the website.
-        - Scrape all available text from these URL link.
-        - Organize scrapped text storing actual text and its metadata.
+        - Fetch pages of these URL links and archive their raw HTML (fetch stage).
+        - Clean the archived raw HTML in a process pool, organize scrapped text storing actual text and
+          its metadata (cleaning stage).
         - Save all scrapped text locally."""
     
-    def __init__(self, main_url=MAIN_URL, payload=payload, api_url=API_URL):
+    def __init__(
+            self, main_url=MAIN_URL, payload=payload, api_url=API_URL, n_pages=N_PAGES, backend='sync',
+            manifest_path=MANIFEST_PATH, full_refresh=False, static_first=True,
+            dead_letter_path=DEAD_LETTER_PATH, retry_dead_letters=False,
+            catalogue_cache_dir=CATALOGUE_CACHE_DIR, new_only=False,
+            raw_archive_dir=RAW_ARCHIVE_DIR, clean_workers=CLEAN_WORKERS, fetch_only=False,
+            corpus_path=CORPUS_PATH
+            ):
         self.main_url: str = main_url
         self.payload: str = payload
         self.api_url: str = api_url
+        self.n_pages: int = n_pages
+        self.backend: str = backend
+        self.full_refresh: bool = full_refresh
+        self.static_first: bool = static_first
+        self.session = build_http_session(pool_size=n_pages)
+        self.manifest: CrawlManifest = CrawlManifest(path=manifest_path)
+        self.dead_letters: DeadLetterList = DeadLetterList(path=dead_letter_path)
+        self.retry_dead_letters: bool = retry_dead_letters
+        self.retry_policy: RetryPolicy = RetryPolicy(max_retries=MAX_RETRIES, time_budget=RETRY_TIME_BUDGET)
+        self.circuit_breaker: CircuitBreaker = CircuitBreaker(
+            failure_threshold=FAILURE_THRESHOLD, cooldown=CIRCUIT_COOLDOWN
+            )
+        self.catalogue_cache: CatalogueCache = CatalogueCache(cache_dir=catalogue_cache_dir)
+        self.previous_catalogue: list = None
+        self.new_only: bool = new_only
+        self.urls_to_scrape: set = None  # None means all collected URLs
+        self.raw_archive: RawPageArchive = RawPageArchive(archive_dir=raw_archive_dir)
+        self.clean_workers: int = clean_workers
+        self.corpus: CorpusStore = CorpusStore(path=corpus_path)
+        self.rebuilt_corpus: CorpusStore = None  # set while the whole archive is being cleaned
+        self.fetch_only: bool = fetch_only
+        self.fetched_urls: set = set()
+        self._fetched_lock = threading.Lock()
 
     def get_response(self) -> list:
-        """Get API response"""
-        r = requests.get(self.api_url, json=self.payload)
-        response = r.text.split('"redirects.js"')[-1].split('const a=')[-1].split(';t.autorun((()=>')[0]
-        response = json.loads(response.replace('oldUrl', '"oldUrl"').replace('newUrl', '"newUrl"'))
+        """
+        Get API response. The request is conditional on the validators of the cached catalogue: an
+        unchanged catalogue is answered with 304 and loaded from the cache, a changed bundle is parsed
+        only if its content hash is not cached yet. The previously cached catalogue is kept in
+        self.previous_catalogue for diffing.
+        """
+        self.previous_catalogue: list = self.catalogue_cache.load_catalogue()
+        headers: dict = self.catalogue_cache.conditional_headers() if self.previous_catalogue is not None else {}
+        r = self.session.get(self.api_url, json=self.payload, headers=headers, timeout=60)
+        if r.status_code == 304:
+            logger.info('Podcast catalogue is not modified, cached catalogue is used.')
+            return self.previous_catalogue
+
+        content_hash: str = get_content_hash(text=r.text)
+        response: list = self.catalogue_cache.load_catalogue(content_hash=content_hash)
+        if response is None:
+            response = r.text.split('"redirects.js"')[-1].split('const a=')[-1].split(';t.autorun((()=>')[0]
+            response = json.loads(response.replace('oldUrl', '"oldUrl"').replace('newUrl', '"newUrl"'))
+        self.catalogue_cache.save_catalogue(
+            catalogue=response,
+            content_hash=content_hash,
+            etag=r.headers.get('ETag'),
+            last_modified=r.headers.get('Last-Modified'),
+            )
+
         return response
     
-    def scrape_podcasts_urls(self, response: str) -> list:
+    def scrape_podcasts_urls(self, response: str, new_only: bool = False) -> list:
         """
-        Analyze API response and collect podcast-related URLs with main metadata
+        Analyze API response and collect podcast-related URLs with main metadata. If new_only is set, only
+        podcast URLs missing in the previously cached catalogue are collected.
         """
         if type(response) == list and len(response) > 0:
+            known_urls: set = set()
+            if new_only and self.previous_catalogue is not None:
+                known_urls: set = {this_link['newUrl'] for this_link in self.previous_catalogue}
+
             l: list = []
             for i, this_link in enumerate(response):
                 full_link: str = '/'.join([MAIN_URL, this_link['newUrl']])
+                if this_link['newUrl'] in known_urls:
+                    continue
                 if '/podcast/' in full_link:
                     logger.info(f'Collecting URL: {i+1}: {this_link["newUrl"]}')
                     d: dict = {
@@ -88,153 +299,415 @@ class TextScrapper:
         
         return l
     
-    def handle_parapgraphs(self, all_text_sections: BeautifulSoup, tag: str) -> list:
+    def retry_on_load_page(self, url: str, page) -> bool:
         """
-        Iterate through text paragrapsh whether they are based on <div> or <p> tags in the HTML code
+        Load the page by given URL with Playwright following the retry policy: exponential backoff with
+        jitter between attempts, time budget per URL and no retries of permanent errors (e.g. 404). Every
+        attempt waits while the circuit breaker of the host is open. Raise PageLoadError if the URL is
+        given up.
         """
-        l_text: list = []
-        for this_paragraph in all_text_sections.find_all(tag):
-            actual_text: str = clean_paragprah_text(paragraph_text=this_paragraph.text)
-            if (len(actual_text) > 0) and (actual_text.upper() != 'Show all'.upper()):
-                l_text.append(actual_text)
+        started_at: float = time.monotonic()
+        attempt: int = 0
+        while True:
+            time.sleep(self.circuit_breaker.wait_time(url=url))
+            attempt += 1
+            logger.info(f'::: attempt to load review section: {attempt} : {url}')
+            try:
+                response = page.goto(
+                    f'{url}', wait_until="networkidle", timeout=25_000
+                )
+                if response is not None:
+                    check_response_status(status=response.status)
+                self.circuit_breaker.record_success(url=url)
+                page.set_default_timeout(60_000)  # 120 seconds
+                return True
+            except PermanentPageError as e:
+                self.circuit_breaker.record_success(url=url)
+                raise PageLoadError(url=url, reason=describe_error(error=e), attempts=attempt)
+            except Exception as e:
+                self.circuit_breaker.record_failure(url=url)
+                delay: float = self.retry_policy.next_delay(attempt=attempt, started_at=started_at, error=e)
+                if delay is None:
+                    raise PageLoadError(url=url, reason=describe_error(error=e), attempts=attempt)
+            time.sleep(delay)
 
-        return l_text
-    
-    def retry_on_load_page(self, url: str) -> bool:
+    async def retry_on_load_page_async(self, url: str, page) -> bool:
         """
-        Repeat load the page by given URL MAX_RETRIES times or till a page with full DOM is fully loaded using
-        Playwright.
+        Asynchronous version of retry_on_load_page: other podcast pages keep loading while this one
+        is being retried.
         """
-        loaded: bool = True
-        for _ in range(MAX_RETRIES):
-            logger.info(f'::: attempt to load review section: {_ + 1} : {url}')
+        started_at: float = time.monotonic()
+        attempt: int = 0
+        while True:
+            await asyncio.sleep(self.circuit_breaker.wait_time(url=url))
+            attempt += 1
+            logger.info(f'::: attempt to load review section: {attempt} : {url}')
             try:
-                loaded: bool = True
-                self.page.goto(
+                response = await page.goto(
                     f'{url}', wait_until="networkidle", timeout=25_000
                 )
-                self.page.set_default_timeout(60_000)  # 120 seconds
-                break
-            except:
-                loaded: bool = False
-                pass
-
-        return loaded
+                if response is not None:
+                    check_response_status(status=response.status)
+                self.circuit_breaker.record_success(url=url)
+                page.set_default_timeout(60_000)  # 120 seconds
+                return True
+            except PermanentPageError as e:
+                self.circuit_breaker.record_success(url=url)
+                raise PageLoadError(url=url, reason=describe_error(error=e), attempts=attempt)
+            except Exception as e:
+                self.circuit_breaker.record_failure(url=url)
+                delay: float = self.retry_policy.next_delay(attempt=attempt, started_at=started_at, error=e)
+                if delay is None:
+                    raise PageLoadError(url=url, reason=describe_error(error=e), attempts=attempt)
+            await asyncio.sleep(delay)
     
-    def load_dynamic_page(self, page_url: str) -> bool:
+    def load_dynamic_page(self, page_url: str, page) -> bool:
         """
         Load a dynamic page with Playwright and return error if fail
         """
-        loaded: bool = self.retry_on_load_page(url=page_url)
-        success: bool = True
-        if not loaded:
-            error_msg_load_page(url=page_url, max_retries=MAX_RETRIES)
-            success: bool = not success
+        try:
+            return self.retry_on_load_page(url=page_url, page=page)
+        except PageLoadError as e:
+            error_msg_load_page(url=page_url, max_retries=e.attempts)
+            raise
 
-        return success
+    async def load_dynamic_page_async(self, page_url: str, page) -> bool:
+        """
+        Asynchronous version of load_dynamic_page
+        """
+        try:
+            return await self.retry_on_load_page_async(url=page_url, page=page)
+        except PageLoadError as e:
+            error_msg_load_page(url=page_url, max_retries=e.attempts)
+            raise
     
-    def save_data_to_json(self, data: dict, filename: str) -> None:
+    def fetch_static_podcast_page(self, page_url: str) -> tuple:
         """
-        Save scrapped data to external JSON file
+        Try to get the information section and the podcast text section from the static HTML of the page
+        with a plain HTTP request. Return None if any of them is missing, so the page has to be rendered
+        with Playwright. The request is skipped while the circuit breaker of the host is open and its
+        outcome is recorded by the circuit breaker.
         """
-        save_to_json(data=data, filename=filename)
+        if not self.circuit_breaker.allow(url=page_url):
+            return None
+
+        try:
+            html_for_scrapping: BeautifulSoup = prepare_page_for_scrapping(page_url=page_url, session=self.session)
+        except requests.HTTPError as e:
+            if e.response.status_code in PERMANENT_HTTP_STATUSES:
+                self.circuit_breaker.record_success(url=page_url)
+                raise PageLoadError(url=page_url, reason=f'HTTP {e.response.status_code}', attempts=1)
+            self.circuit_breaker.record_failure(url=page_url)
+            logger.info(f'Static fetch failed for {page_url}: {e}')
+            return None
+        except requests.RequestException as e:
+            self.circuit_breaker.record_failure(url=page_url)
+            logger.info(f'Static fetch failed for {page_url}: {e}')
+            return None
+        self.circuit_breaker.record_success(url=page_url)
+
+        information_section = html_for_scrapping.select_one('.information')
+        if information_section is None:
+            return None
+
+        for this_text_tag in possible_text_tags:
+            text_section = html_for_scrapping.select_one(this_text_tag)
+            if text_section is not None:
+                return information_section.decode_contents(), text_section.decode_contents()
 
         return None
-    
-    def _full_podcast_text_cleaning_heuristic(self, podcast_text: str) -> str:
+
+    def fetch_podcast_page(self, page, page_url: str) -> tuple:
         """
-        Steps to implement overall full podcast text cleaning and preparation
+        Load the podcast page in the given browser page and return the inner HTML of the information
+        section and of the section holding the actual podcast text (None if text is not found)
         """
-        podcast_text: str = remove_timestamps(podcast_text=podcast_text)
-        podcast_text: str = clean_paragprah_text(paragraph_text=podcast_text)
-        podcast_text: str = fix_urls_definitions(podcast_text=podcast_text)
-        podcast_text: str = split_by_doubled_text(podcast_text=podcast_text)
+        self.load_dynamic_page(page_url=page_url, page=page)
+        information_html: str = page.inner_html('.information')
 
-        return podcast_text
-    
-    def scrape_podcast_text(self, list_of_urls: list[dict]) -> list[dict]:
+        # Recognize the correct tag of HTML code where the actual podcast text is stored
+        html_text: str = None
+        for this_text_tag in possible_text_tags:
+            if page.query_selector(this_text_tag) is not None:
+                html_text: str = page.inner_html(this_text_tag)
+                break
+
+        return information_html, html_text
+
+    async def fetch_podcast_page_async(self, page, page_url: str) -> tuple:
         """
-        Receive collected podcast urls and scrape actual text from there
+        Asynchronous version of fetch_podcast_page
         """
-        list_of_urls_ = list_of_urls
+        await self.load_dynamic_page_async(page_url=page_url, page=page)
+        information_html: str = await page.inner_html('.information')
+
+        html_text: str = None
+        for this_text_tag in possible_text_tags:
+            if await page.query_selector(this_text_tag) is not None:
+                html_text: str = await page.inner_html(this_text_tag)
+                break
+
+        return information_html, html_text
+
+    def save_podcast_record(self, record: dict) -> str:
+        """
+        Append the actual record (article text with metadata) to the corpus (or to the corpus being
+        rebuilt). Return the corpus filename.
+        """
+        (self.rebuilt_corpus or self.corpus).append(record=record)
+
+        return self.corpus.path
+
+    def finish_podcast(self, url: str, record: dict) -> None:
+        """
+        Save the built podcast record (if the text was found) and register the result in the crawl manifest
+        """
+        if record is None:
+            self.manifest.record(url=url, status=STATUS_TEXT_NOT_FOUND)
+        else:
+            filename: str = self.save_podcast_record(record=record)
+            self.manifest.record(
+                url=url,
+                status=STATUS_SCRAPPED,
+                content_hash=get_content_hash(text=record['full_text']),
+                filename=filename,
+                )
+
+        return None
+
+    def store_raw_page(self, i: int, record: dict, information_html: str, html_text: str) -> None:
+        """
+        Archive raw HTML sections of the fetched podcast page for the cleaning stage and register the fetch
+        in the crawl manifest
+        """
+        self.raw_archive.save(i=i, record=record, information_html=information_html, html_text=html_text)
+        self.manifest.record(
+            url=record['url'],
+            status=STATUS_FETCHED,
+            content_hash=get_content_hash(text=html_text) if html_text is not None else None,
+            )
+        with self._fetched_lock:
+            self.fetched_urls.add(record['url'])
+
+        return None
 
-        with sync_playwright() as playwright:
-            #for i in range(0, len(list_of_urls)):
-            for i in range(993, len(list_of_urls)):
-                this_record: dict = list_of_urls[i]
-                logger.info(f'{i+1}, {this_record["url"]}')
-
-                browser = playwright.chromium.launch(headless=True, slow_mo=1500)
-                # <---- browsing logic: start
-                self.page = browser.new_page()
-                self.page.route("**/*", block_aggressively)
-                self.load_dynamic_page(page_url=this_record['url'])
-
-                if 'sds-' in this_record['url']:
-                    page_title_: str = this_record['url'].split('sds-')[-1][4:]
-                    podcast_number: str = re.search(r'[\w]{3}-[\d+]*', this_record['url']).group()
-                    static_part, dynamic_part = podcast_number.split('-')
-                    podcast_number: str = f'{static_part}-{str(int(dynamic_part)).zfill(4)}'
-                elif 'podcast-' in this_record['url']:
-                    page_title_: str = this_record['url'].split('podcast-')[-1]
-                    podcast_number: str = f'cus-{str(i+1).zfill(4)}'
-                elif '/podcast/' in this_record['url']:
-                    page_title_: str = this_record['url'].split('/')[-1].strip()
-                    podcast_number: str = f'cus-{str(i+1).zfill(4)}'
-                
-                page_title: str = page_title_.split(f'{podcast_number}: ')[-1]
-                podcast_date: str = parse_date(
-                    date_string=BeautifulSoup(
-                        self.page.inner_html('.information'), 'html.parser'
-                        ) \
-                            .find_all('p')[-1].text) \
-                            .strip()
-
-                # Recognize the correct tag of HTML code where the actual podcast text is stored
-                text_found: bool = False
-                for this_text_tag in possible_text_tags:
-                    if self.page.query_selector(this_text_tag) is not None:
-                        html_text = self.page.inner_html(this_text_tag)
-                        text_found: bool = True
+    def clean_raw_pages(self, urls: set = None) -> None:
+        """
+        Cleaning stage: stream archived raw pages (only pages of the given URLs if set) out to a pool of
+        self.clean_workers processes and append the cleaned podcast records to the corpus. At most two
+        pages per worker are in flight, so the archive is never loaded into memory all at once. Cleaning
+        of the whole archive rebuilds the corpus in a separate file which replaces records of archived
+        URLs only at the end, records of URLs missing in the archive (e.g. imported ones) are kept.
+        """
+        if urls is None:
+            self.rebuilt_corpus = CorpusStore(path=f'{self.corpus.path}.rebuild')
+            self.rebuilt_corpus.clear()
+        try:
+            n_cleaned: int = self._clean_raw_pages(urls=urls)
+        finally:
+            rebuilt_corpus, self.rebuilt_corpus = self.rebuilt_corpus, None
+
+        logger.info(f'Cleaning stage is finished with {n_cleaned} podcast pages.')
+        if rebuilt_corpus is not None:
+            self.corpus.replace_from(
+                rebuilt=rebuilt_corpus, replaced_urls=set(self.raw_archive.load_index().keys())
+                )
+        else:
+            self.corpus.compact()
+
+        return None
+
+    def _clean_raw_pages(self, urls: set) -> int:
+        """
+        Clean archived raw pages in the process pool, return the number of cleaned pages
+        """
+        n_cleaned: int = 0
+        in_flight: set = set()
+        with ProcessPoolExecutor(max_workers=self.clean_workers, initializer=_init_cleaning_worker) as executor:
+            raw_pages = self.raw_archive.iter_pages(urls=urls)
+            while True:
+                for raw_page in raw_pages:
+                    in_flight.add(executor.submit(_clean_raw_page, raw_page))
+                    if len(in_flight) >= 2 * self.clean_workers:
                         break
-                # browsing logic: end ---->
+                if len(in_flight) == 0:
+                    break
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for this_future in done:
+                    url, record, error = this_future.result()
+                    if error is not None:
+                        self.register_failed_podcast(url=url, error=error)
+                    else:
+                        self.finish_podcast(url=url, record=record)
+                    n_cleaned += 1
+
+        return n_cleaned
+
+    def register_failed_podcast(self, url: str, error: Exception) -> None:
+        """
+        Register the failed URL in the crawl manifest and in the dead-letter list
+        """
+        logger.error(f'Failed to scrape {url}: {error}')
+        self.manifest.record(url=url, status=STATUS_FAILED)
+        self.dead_letters.record(
+            url=url,
+            reason=describe_error(error=error),
+            attempts=error.attempts if isinstance(error, PageLoadError) else None,
+            )
+
+        return None
+
+    def podcast_positions(self, list_of_urls: list[dict]) -> list[int]:
+        """
+        Positions of the collected podcast URLs which have to be scrapped. URLs already scrapped according
+        to the crawl manifest are skipped unless full refresh is requested. If self.urls_to_scrape is set
+        (dead-letter re-run, new catalogue entries), only these URLs are taken.
+        """
+        if self.urls_to_scrape is not None:
+            positions: list[int] = [
+                i for i, this_record in enumerate(list_of_urls) if this_record['url'] in self.urls_to_scrape
+            ]
+            logger.info(f'{len(positions)} of {len(list_of_urls)} podcast pages are selected to be scrapped.')
+            return positions
+
+        positions: list[int] = [
+            i for i, this_record in enumerate(list_of_urls)
+            if self.full_refresh or not self.manifest.is_scrapped(url=this_record['url'])
+        ]
+        logger.info(f'{len(positions)} of {len(list_of_urls)} podcast pages have to be scrapped.')
+
+        return positions
+
+    def _page_worker(self, work_queue: queue.Queue, list_of_urls: list[dict]) -> None:
+        """
+        Keep one browser and one page alive and fetch podcasts taken from the shared work queue till
+        the stop signal (None) is received. Playwright sync API objects are bound to the thread which
+        created them, therefore every worker drives its own browser. Playwright and the browser are
+        started only when the first page which can not be scrapped from static HTML shows up, inside the
+        handling of that page, so a browser failure is registered as a failure of the page and the worker
+        keeps taking URLs till the stop signal.
+        """
+        playwright = None
+        browser = None
+        page = None
+
+        while True:
+            i: int = work_queue.get()
+            if i is None:
+                break
+
+            this_record: dict = list_of_urls[i]
+            logger.info(f'{i+1}, {this_record["url"]}')
+            try:
+                fetched: tuple = None
+                if self.static_first:
+                    fetched: tuple = self.fetch_static_podcast_page(page_url=this_record['url'])
+                if fetched is None:
+                    if playwright is None:
+                        playwright = sync_playwright().start()
+                    if browser is None:
+                        browser = playwright.chromium.launch(headless=True, slow_mo=SLOW_MO)
+                    if page is None:
+                        page = browser.new_page()
+                        page.route("**/*", block_aggressively)
+                    fetched: tuple = self.fetch_podcast_page(page=page, page_url=this_record['url'])
+
+                information_html, html_text = fetched
+                self.store_raw_page(
+                    i=i, record=this_record, information_html=information_html, html_text=html_text
+                    )
+            except Exception as e:
+                self.register_failed_podcast(url=this_record['url'], error=e)
+
+        # The stop signal is taken already, a failed shutdown must not block the crawl
+        try:
+            if browser is not None:
                 browser.close()
+        except Exception as e:
+            logger.error(f'Browser of the worker failed to close: {e}')
+        try:
+            if playwright is not None:
+                playwright.stop()
+        except Exception as e:
+            logger.error(f'Playwright of the worker failed to stop: {e}')
+
+        return None
+
+    def scrape_podcast_text(self, list_of_urls: list[dict]) -> list[dict]:
+        """
+        Receive collected podcast urls and fetch their pages (fetch stage). URLs are distributed through
+        a bounded work queue over a pool of self.n_pages concurrently running browser pages.
+        """
+        list_of_urls_ = list_of_urls
+
+        work_queue: queue.Queue = queue.Queue(maxsize=2 * self.n_pages)
+        workers: list = [
+            threading.Thread(target=self._page_worker, args=(work_queue, list_of_urls_), daemon=True)
+            for _ in range(self.n_pages)
+        ]
+        for this_worker in workers:
+            this_worker.start()
 
-                if text_found:
-                    html_text_for_scrapping: BeautifulSoup = BeautifulSoup(html_text, 'html.parser')
-                    l_text: list = []
-                    if len(html_text_for_scrapping.find_all('p')) > 1:
-                        l_text: list = self.handle_parapgraphs(all_text_sections=html_text_for_scrapping, tag='p')
-
-                    elif len(html_text_for_scrapping.find_all('div')) > 0:
-                        l_text: list = self.handle_parapgraphs(all_text_sections=html_text_for_scrapping, tag='div')
-                    
-                    full_text: str = ' '.join(list(l_text))
-                    full_text: str = self._full_podcast_text_cleaning_heuristic(podcast_text=full_text)
-                    
-                    list_of_urls_[i]['full_text'] = full_text
-                    list_of_urls_[i]['title'] = page_title
-                    list_of_urls_[i]['date'] = podcast_date
-                    list_of_urls_[i]['number'] = podcast_number
-                    list_of_urls_[i]['n_words'] = len(full_text.split(' '))
-                    list_of_urls_[i]['n_chars'] = len(full_text)
-                    list_of_urls_[i]['n_sentences'] = len(full_text.split('. '))
-                    list_of_urls_[i]['tokens_count'] = len(full_text) / 4  # 1 token = ~4 characters
-                    # TODO: add timestamp of each podcast
-
-                    # Generate filename and save the actual record (article text with metadata)
-                    filename: str = generate_scrapped_podcast_filename(
-                        title=list_of_urls_[i]["title"],
-                        number=list_of_urls_[i]["number"],
-                        date=podcast_date
-                        )
-                    self.save_data_to_json(
-                        data=list_of_urls_[i],
-                        filename=filename
-                        )
-                
-                else:
-                    logger.info(f'Text not found for {this_record["url"]}')
+        for i in self.podcast_positions(list_of_urls=list_of_urls_):
+            work_queue.put(i)
+
+        # One stop signal per worker
+        for _ in workers:
+            work_queue.put(None)
+        for this_worker in workers:
+            this_worker.join()
+
+        return list_of_urls_
+
+    async def _scrape_single_podcast_async(self, browser, semaphore: asyncio.Semaphore, i: int, record: dict) -> None:
+        """
+        Fetch a single podcast page as an asyncio task. Page loads are bounded by the semaphore while
+        storing the raw page runs in a worker thread, so the event loop keeps driving other pages.
+        """
+        async with semaphore:
+            logger.info(f'{i+1}, {record["url"]}')
+            try:
+                fetched: tuple = None
+                if self.static_first:
+                    fetched: tuple = await asyncio.to_thread(self.fetch_static_podcast_page, page_url=record['url'])
+                if fetched is None:
+                    page = await browser.new_page()
+                    try:
+                        await page.route("**/*", block_aggressively_async)
+                        fetched: tuple = await self.fetch_podcast_page_async(page=page, page_url=record['url'])
+                    finally:
+                        await page.close()
+            except Exception as e:
+                self.register_failed_podcast(url=record['url'], error=e)
+                return None
+
+        information_html, html_text = fetched
+
+        try:
+            await asyncio.to_thread(
+                self.store_raw_page, i=i, record=record, information_html=information_html, html_text=html_text
+                )
+        except Exception as e:
+            self.register_failed_podcast(url=record['url'], error=e)
+
+        return None
+
+    async def scrape_podcast_text_async(self, list_of_urls: list[dict]) -> list[dict]:
+        """
+        Asynchronous backend of scrape_podcast_text: one browser is shared by all tasks and at most
+        self.n_pages pages are open at the same time.
+        """
+        list_of_urls_ = list_of_urls
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.n_pages)
+
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=True, slow_mo=SLOW_MO)
+            await asyncio.gather(*[
+                self._scrape_single_podcast_async(browser=browser, semaphore=semaphore, i=i, record=list_of_urls_[i])
+                for i in self.podcast_positions(list_of_urls=list_of_urls_)
+            ])
+            await browser.close()
 
         return list_of_urls_
 
@@ -244,14 +717,66 @@ class TextScrapper:
         """
         response: list = self.get_response()
         podcast_urls: list[dict] = self.scrape_podcasts_urls(response=response)
-        podcast_text: list[dict] = self.scrape_podcast_text(list_of_urls=podcast_urls)
+        if self.retry_dead_letters:
+            # The list is emptied and collects the new failures of this run
+            self.urls_to_scrape: set = set(self.dead_letters.load_urls())
+            self.dead_letters.clear()
+        elif self.new_only:
+            new_podcast_urls: list[dict] = self.scrape_podcasts_urls(response=response, new_only=True)
+            self.urls_to_scrape: set = {this_record['url'] for this_record in new_podcast_urls}
+        if self.backend == 'async':
+            podcast_text: list[dict] = asyncio.run(self.scrape_podcast_text_async(list_of_urls=podcast_urls))
+        else:
+            podcast_text: list[dict] = self.scrape_podcast_text(list_of_urls=podcast_urls)
+        logger.info(f'Fetch stage is finished with {len(self.fetched_urls)} podcast pages.')
+        if not self.fetch_only:
+            # Pages fetched by earlier runs which were not cleaned (--fetch-only run or crashed cleaning
+            # stage) are not fetched again, so they are cleaned together with the pages of this run
+            urls_to_clean: set = self.fetched_urls | self.manifest.urls_with_status(status=STATUS_FETCHED)
+            n_leftover: int = len(urls_to_clean) - len(self.fetched_urls)
+            if n_leftover > 0:
+                logger.info(f'{n_leftover} podcast pages fetched by earlier runs are not cleaned yet.')
+            if len(urls_to_clean) > 0:
+                self.clean_raw_pages(urls=urls_to_clean)
         logger.info('Texts are colllected!')
 
+        n_failed: int = len(self.dead_letters.load_urls())
+        if n_failed > 0:
+            logger.warning(f'{n_failed} podcast pages failed, re-run them with --retry-dead-letters.')
+
 
-def main():
+def main(
+        n_pages: int = N_PAGES,
+        backend: str = 'sync',
+        full_refresh: bool = False,
+        static_first: bool = True,
+        retry_dead_letters: bool = False,
+        new_only: bool = False,
+        clean_only: bool = False,
+        fetch_only: bool = False,
+        clean_workers: int = CLEAN_WORKERS,
+        import_json: bool = False,
+        ):
     """Run scrapper pipeline"""
-    job = TextScrapper()
-    job.collect_podcast_urls_from_website()
+    job = TextScrapper(
+        n_pages=n_pages,
+        backend=backend,
+        full_refresh=full_refresh,
+        static_first=static_first,
+        retry_dead_letters=retry_dead_letters,
+        new_only=new_only,
+        fetch_only=fetch_only,
+        clean_workers=clean_workers,
+        )
+    if import_json:
+        # Move podcasts saved one per JSON file (previous output format) to the corpus
+        job.corpus.import_json_files(folder=os.path.dirname(job.corpus.path))
+        job.corpus.compact()
+    elif clean_only:
+        # Re-run cleaning rules on the whole raw page archive without touching the network
+        job.clean_raw_pages()
+    else:
+        job.collect_podcast_urls_from_website()
     logger.info('Scrapper job is finished.')
 
 
@@ -260,9 +785,47 @@ if __name__ == '__main__':
 
     arg_parser = argparse.ArgumentParser(description='Podcast texts scrapper')
     arg_parser.add_argument('--run', default=False, action='store_true')
+    arg_parser.add_argument('--pages', default=N_PAGES, type=int, help='Number of pages scraped concurrently')
+    arg_parser.add_argument('--backend', default='sync', choices=BACKENDS, help='Scraping backend')
+    arg_parser.add_argument(
+        '--full-refresh', default=False, action='store_true', help='Scrape all podcasts ignoring the crawl manifest'
+        )
+    arg_parser.add_argument(
+        '--browser-only', default=False, action='store_true', help='Skip the static HTTP fetch and always use Playwright'
+        )
+    arg_parser.add_argument(
+        '--retry-dead-letters', default=False, action='store_true', help='Scrape only URLs from the dead-letter list'
+        )
+    arg_parser.add_argument(
+        '--new-only', default=False, action='store_true', help='Scrape only podcasts added since the cached catalogue'
+        )
+    arg_parser.add_argument(
+        '--clean-only', default=False, action='store_true', help='Only clean the archived raw pages (no network)'
+        )
+    arg_parser.add_argument(
+        '--fetch-only', default=False, action='store_true', help='Only fetch and archive raw pages, skip cleaning'
+        )
+    arg_parser.add_argument(
+        '--clean-workers', default=CLEAN_WORKERS, type=int, help='Number of processes of the cleaning stage'
+        )
+    arg_parser.add_argument(
+        '--import-json', default=False, action='store_true',
+        help='Import podcast JSON files of the output folder to the corpus'
+        )
     args = arg_parser.parse_args()
 
     if args.run:
         logger.info('Starting podcast text scrapper')
         # Run the pipeline
-        main()
+        main(
+            n_pages=args.pages,
+            backend=args.backend,
+            full_refresh=args.full_refresh,
+            static_first=not args.browser_only,
+            retry_dead_letters=args.retry_dead_letters,
+            new_only=args.new_only,
+            clean_only=args.clean_only,
+            fetch_only=args.fetch_only,
+            clean_workers=args.clean_workers,
+            import_json=args.import_json,
+            )
@@ -0,0 +1,88 @@
+"""
+This helper file caches the podcast URL catalogue (redirects.js bundle) on disk, so unchanged catalogues
+are confirmed with a conditional request (ETag / Last-Modified) and never parsed again.
+"""
+
+import os
+import json
+import time
+import logging
+
+# Set-up a logger
+logging.Formatter.converter = time.gmtime
+logger = logging.getLogger(__name__)
+
+# System constansts
+META_FILENAME: str = 'catalogue_meta.json'
+
+
+class CatalogueCache:
+    """
+    Keep validators of the last downloaded catalogue and the parsed catalogue keyed by the content hash
+    of the downloaded bundle
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir: str = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.meta: dict = self._read_json(filename=META_FILENAME) or {}
+
+    def _read_json(self, filename: str):
+        """
+        Read JSON file from the cache folder, return None if it does not exist
+        """
+        path: str = os.path.join(self.cache_dir, filename)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as fh:
+            return json.load(fh)
+
+    def _write_json(self, data, filename: str) -> None:
+        """
+        Write JSON file to the cache folder
+        """
+        with open(os.path.join(self.cache_dir, filename), 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, ensure_ascii=False)
+
+        return None
+
+    def conditional_headers(self) -> dict:
+        """
+        HTTP headers which make the server answer 304 Not Modified if the catalogue did not change
+        """
+        headers: dict = {}
+        if self.meta.get('etag'):
+            headers['If-None-Match'] = self.meta['etag']
+        if self.meta.get('last_modified'):
+            headers['If-Modified-Since'] = self.meta['last_modified']
+
+        return headers
+
+    def load_catalogue(self, content_hash: str = None) -> list:
+        """
+        Load parsed catalogue by the content hash of its bundle (the last cached one by default)
+        """
+        content_hash: str = content_hash or self.meta.get('content_hash')
+        if content_hash is None:
+            return None
+
+        return self._read_json(filename=f'catalogue_{content_hash}.json')
+
+    def save_catalogue(self, catalogue: list, content_hash: str, etag: str = None, last_modified: str = None) -> None:
+        """
+        Store parsed catalogue with its validators, the previously cached catalogue is removed
+        """
+        previous_hash: str = self.meta.get('content_hash')
+        self._write_json(data=catalogue, filename=f'catalogue_{content_hash}.json')
+        self.meta: dict = {
+            'content_hash': content_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+        }
+        self._write_json(data=self.meta, filename=META_FILENAME)
+
+        previous_path: str = os.path.join(self.cache_dir, f'catalogue_{previous_hash}.json')
+        if previous_hash != content_hash and os.path.exists(previous_path):
+            os.remove(previous_path)
+
+        return None
@@ -0,0 +1,122 @@
+"""
+This helper file keeps all scrapped podcast records in one compact JSON Lines corpus file, so the
+scrapper appends to a single file and the chunking pipeline loads the corpus in one sequential read.
+"""
+
+import os
+import glob
+import json
+import time
+import logging
+import threading
+
+# Set-up a logger
+logging.Formatter.converter = time.gmtime
+logger = logging.getLogger(__name__)
+
+
+class CorpusStore:
+    """
+    Append-only corpus with one podcast record (url, title, date, number, n_words, full_text, ...) per
+    line. A re-scrapped podcast is appended again, compact() keeps only the last record of every URL.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+
+    def append(self, record: dict) -> None:
+        """
+        Append podcast record to the corpus (thread safe)
+        """
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        return None
+
+    def iter_records(self):
+        """
+        Stream podcast records one by one in the order they were appended
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding='utf-8') as fh:
+            for this_line in fh:
+                if this_line.strip():
+                    yield json.loads(this_line)
+
+    def clear(self) -> None:
+        """
+        Remove all records (before the whole corpus is rebuilt)
+        """
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+        return None
+
+    def compact(self) -> int:
+        """
+        Rewrite the corpus keeping only the last record of every URL, return the number of records
+        """
+        with self._lock:
+            records: dict = {}
+            for this_record in self.iter_records():
+                records.pop(this_record['url'], None)
+                records[this_record['url']] = this_record
+
+            tmp_path: str = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                for this_record in records.values():
+                    fh.write(json.dumps(this_record, ensure_ascii=False) + '\n')
+            os.replace(tmp_path, self.path)
+
+        logger.info(f'Corpus is compacted to {len(records)} podcast records.')
+
+        return len(records)
+
+    def replace_from(self, rebuilt: 'CorpusStore', replaced_urls: set) -> int:
+        """
+        Atomically replace records of the given URLs with the records of the rebuilt corpus, records of
+        other URLs are kept. The rebuilt corpus file is removed. Return the number of records.
+        """
+        with self._lock:
+            records: dict = {}
+            for this_record in self.iter_records():
+                if this_record['url'] not in replaced_urls:
+                    records.pop(this_record['url'], None)
+                    records[this_record['url']] = this_record
+            n_kept = len(records)
+            for this_record in rebuilt.iter_records():
+                records.pop(this_record['url'], None)
+                records[this_record['url']] = this_record
+
+            tmp_path: str = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as fh:
+                for this_record in records.values():
+                    fh.write(json.dumps(this_record, ensure_ascii=False) + '\n')
+            os.replace(tmp_path, self.path)
+        rebuilt.clear()
+
+        logger.info(
+            f'Corpus is rebuilt with {len(records)} podcast records, {n_kept} records of URLs missing in the '
+            f'rebuild are kept.'
+        )
+
+        return len(records)
+
+    def import_json_files(self, folder: str) -> int:
+        """
+        Append podcast records stored one per JSON file in the given folder (previous output format),
+        return the number of imported records
+        """
+        n_imported: int = 0
+        for this_file in sorted(glob.glob(os.path.join(folder, '*.json'))):
+            with open(this_file, encoding='utf-8') as fh:
+                self.append(record=json.load(fh))
+            n_imported += 1
+        logger.info(f'{n_imported} podcast JSON files are imported to the corpus.')
+
+        return n_imported
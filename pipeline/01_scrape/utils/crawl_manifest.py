@@ -0,0 +1,138 @@
+"""
+This helper file keeps a persistent crawl manifest (JSON Lines file) with the status of every
+scrapped podcast URL, so repeated or interrupted crawls only fetch new and failed podcast pages.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+# Set-up a logger
+logging.Formatter.converter = time.gmtime
+logger = logging.getLogger(__name__)
+
+# System constansts
+STATUS_SCRAPPED: str = 'scrapped'
+STATUS_TEXT_NOT_FOUND: str = 'text_not_found'
+STATUS_FAILED: str = 'failed'
+STATUS_FETCHED: str = 'fetched'  # raw page is stored, the cleaning stage did not run yet
+DONE_STATUSES: tuple = (STATUS_SCRAPPED, STATUS_TEXT_NOT_FOUND, STATUS_FETCHED)  # URLs with these statuses are not fetched again
+
+
+def get_content_hash(text: str) -> str:
+    """
+    Return SHA-256 hash of the given text
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class CrawlManifest:
+    """
+    Append-only record of crawl results. Every line stores URL, status, content hash, output filename
+    and timestamp; the last line of a given URL describes its current state.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.entries: dict = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> dict:
+        """
+        Load all existing manifest entries keyed by URL
+        """
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as fh:
+                for this_line in fh:
+                    if this_line.strip():
+                        entry: dict = json.loads(this_line)
+                        self.entries[entry['url']] = entry
+            logger.info(f'Crawl manifest is loaded with {len(self.entries)} URLs.')
+
+        return self.entries
+
+    def is_scrapped(self, url: str) -> bool:
+        """
+        Check if the given URL was already scrapped and does not need to be fetched again
+        """
+        entry: dict = self.entries.get(url)
+
+        return entry is not None and entry['status'] in DONE_STATUSES
+
+    def urls_with_status(self, status: str) -> set:
+        """
+        URLs whose current status is the given one
+        """
+        with self._lock:
+            return {url for url, entry in self.entries.items() if entry['status'] == status}
+
+    def record(self, url: str, status: str, content_hash: str = None, filename: str = None) -> None:
+        """
+        Append crawl result of the given URL to the manifest (thread safe)
+        """
+        entry: dict = {
+            'url': url,
+            'status': status,
+            'content_hash': content_hash,
+            'filename': filename,
+            'timestamp': time.strftime('%Y%m%d_%H%M%S', time.gmtime()),
+        }
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.entries[url] = entry
+
+        return None
+
+
+class DeadLetterList:
+    """
+    Append-only list of URLs which failed to be scrapped, kept for a later targeted re-run
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self._lock = threading.Lock()
+
+    def record(self, url: str, reason: str, attempts: int = None) -> None:
+        """
+        Append failed URL with the failure reason (thread safe)
+        """
+        entry: dict = {
+            'url': url,
+            'reason': reason,
+            'attempts': attempts,
+            'timestamp': time.strftime('%Y%m%d_%H%M%S', time.gmtime()),
+        }
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        return None
+
+    def load_urls(self) -> list[str]:
+        """
+        Load unique failed URLs in the order they failed
+        """
+        urls: dict = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as fh:
+                for this_line in fh:
+                    if this_line.strip():
+                        urls[json.loads(this_line)['url']] = None
+
+        return list(urls)
+
+    def clear(self) -> None:
+        """
+        Remove all failed URLs (before they are re-run)
+        """
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+        return None
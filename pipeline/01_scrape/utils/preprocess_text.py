@@ -3,140 +3,304 @@ This helper file support text cleaning and pre-processing before saving scrappin
 """
 
 import re
+import bisect
 
-def preprocess_sentence(sentence: str) -> str:
+# Phrases replaced in the scrapped text, in the order of application
+PHRASES_TO_REPLACE: dict = {
+    'Linked In': 'Linkedin',
+    '\t': ' ',
+    '\n': ' ',
+    '--':'-',
+    '\ufeff': ' ',
+    "I'll ": 'I will ',
+    "I’ll": "I will",
+    "you're ": "you are ",
+    "You're": "You are",
+    "they’re": "they are",
+    "They’re": "They are",
+    "we'll ": "we will ",
+    "We'll": "We will",
+    "we'll": "we will",
+    "don't": "do not",
+    "Don't": "Do not",
+    "hasn't": "has not",
+    "Hasn't": "Has not",
+    "we've": "we have",
+    "We've": "We have",
+    "it’ll": "it will",
+    "It’ll": "It will",
+    "they’d": "they would",
+    "They’d": "They would",
+    "inaudible": "",
+    " ...": ".",
+    "(Laughs)": "",
+    "there’ll": "there will",
+    "There’ll": "There will",
+    "Can't": "Can not",
+    "can't": "can not",
+    "He’s": "He is",
+    "You’d": "You would",
+    "you’d": "you would",
+    "there’re": "there are",
+    "who’s": "who is",
+    "Who’s": "Who is",
+    "they’ve": "they have",
+    "They’ve": "They have",
+    "You'll ": "You will ",
+    "you'll": "you will",
+    "won’t": "will not",
+    "that’ll": "that will",
+    "wasn’t": "was not",
+    "he'll": "he will",
+    "He'll": "He will",
+    "She'll": "She will",
+    "didn't": "Did not ",
+    "Here’s": "Here is",
+    "we’d": "we would",
+    "We’d": "We would",
+    "you've": "you have",
+    "what's": "what is",
+    "We’re": "We are",
+    "don’t": "do not",
+    "Don’t": "Do not",
+    "you’d": "you would",
+    "didn’t": "did not",
+    "Can’t": "Can not",
+    "shouldn't": "should not",
+    "Shouldn't": "Shouldn't",
+    "What’s": "What is",
+    "hadn’t": "had not",
+    "Hadn’t": "Had not",
+    "wouldn’t": "would not",
+    "we’ve": "we have",
+    "We’ve": "We have",
+    "There’ll": "There will",
+    "weren’t": "were not",
+    "Weren’t": "Were not",
+    "can’t": "can not",
+    "we’re": "we are",
+    "I’d": "I would",
+    "shouldn’t": "should not",
+    "there’s": "there is",
+    "you’ll": "you will",
+    "You’ll": "You will",
+    "There’s": "There is",
+    "else’s": "else is",
+    "I'm ": "I am ",
+    "I’m": "I am",
+    "couldn’t": "could not",
+    "They’ll": "They will",
+    "we're": "we are",
+    "they’ll": "they will",
+    "We’ll": "We will",
+    "we’ll": "we will",
+    "he’s": "he is",
+    "doesn’t": "does not",
+    "I've": "I have",
+    "you’ve": "you have",
+    "You’ve": "You have",
+    "It's": "It is",
+    "it's ": "it is ",
+    "aren’t": "are not",
+    "Aren’t": "Are not",
+    "isn’t": "is not",
+    "what’s": "what is",
+    "haven’t": "have not",
+    "Haven’t": "Have not",
+    "it’s ": "it is ",
+    "It’s": "It is",
+    "I’ve": "I have",
+    "he’ll": "he will",
+    "He’ll": "He will",
+    "that's ": 'that is ',
+    "wasn't": "was not",
+    "isn't": "is not",
+    "Isn't": "Is not",
+    "It'd": "It would",
+    "it'd": "it would",
+    "That’s": "That is",
+    "that’s": "that is",
+    "they'll": "they will",
+    "They'll": "They will",
+    "there‘s": "there is",
+    "That's ": "That is ",
+    "he's": "he is",
+    "He's": "He is",
+    "won't": "will not",
+    "Won't": "Will not",
+    "there's ": "there is ",
+    "they're": "they are",
+    "They're": "They are",
+    "hasn’t": "has not",
+    "Hasn’t": "Has not",
+    "it’d": "it would",
+    "It’d": "It would",
+    "doesn't ": "does not",
+    "you’re": "you are",
+    "You’re": "You are",
+    "there's": "there is",
+    "There's": "There is",
+    "here’s": "here is",
+    "Here’s": "Here is",
+    "I'd": "I would",
+    "who’ve": "who have",
+    "Who’ve": "Who have",
+    "haven't": "have not",
+    "Haven't": "Have not",
+    "There’re": "There are",
+    "there’re": "there are",
+    "couldn't": "could not",
+    "Couldn't": "Could not",
+    "doesn't": "does not",
+    "Doesn't": "Does not",
+    "wouldn't": "would not",
+    "Wouldn't": "Would not",
+    "could't": "could not",
+    "Could't": "Could not",
+    "weren't": "were not",
+    "Weren't": "Were not",
+    "who's": "who is",
+    "Who's": "Who is",
+    "they've": "they have",
+    "They've": "They have",
+    "everything’s": "everything is",
+    "Everything’s": "Everything is",
+    "something’s": "something is",
+    "Something’s": "Something is",
+    "HireVue": "Hirevue",
+    "Py Torch": "PyTorch",
+    "--": "-",
+    'Podcast Transcript': '',
+    "Linked In’s": "Linkedin’s",
+    '(background music plays)': '',
+    "You Tube": "Youtube",
+    "Show allarrow_downward": "",
+    "Until then, happy analyzing.": '',
+    " ] ": "] ",
+    " . ": ". ",
+    "...": ".",
+    "…": ".",
+    "?." : "?",
+    "!." : "!",
+    "*": '',
+    '"': '',
+    '":': '',
+    "()": "",
+}
+
+
+class TextNormaliser:
     """
-    Pre-process scrapped and split sentence to be readable and usable for NER.
+    Ordered phrase replacement table compiled once. Rules are applied one by one in the table order, so
+    later rules see the output of earlier ones (e.g. "..." -> "." followed by "?." -> "?"). A rule is
+    skipped without scanning the text when its gate character (a non-alphanumeric character of the
+    phrase which no earlier rule can introduce) is missing in the text, e.g. all curly-apostrophe
+    contractions of a text written with straight apostrophes.
     """
-    # Handle cases: "e.9"
-    d: dict = {}
-    for this_token in sentence.split(' '):
-        if re.search(r'[^1-9][.]\d+', this_token):
-            temp_seq: list = this_token.split('.')
-            fixed_seq: str = f'{temp_seq[0]}. {temp_seq[1]}'
-            d[this_token] = fixed_seq
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
 
-    # Handle case: 9Self-service
-    d: dict = {}
-    pattern_digit: str = r'\d+'
-    pattern_word: str = r'[a-zA-Z]'
-
-    for this_token in sentence.split(' '):
-        if re.search(r'\d+[a-zA-Z]', this_token):
-            temp_seq: str = re.search(r'\d+[a-zA-Z]', this_token).group()
-            digit: str = re.search(pattern_digit, temp_seq).group()
-            word: str = re.search(pattern_word, temp_seq).group()
-            fixed_seq: str = f'{digit} {word}'
-            d[temp_seq] = fixed_seq
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
+    def __init__(self, replacements: dict):
+        self.rules: list[tuple] = []
+        introduced: set = set()
+        for phrase, replacement in replacements.items():
+            gates: list = [
+                char for char in phrase if not char.isalnum() and char != ' ' and char not in introduced
+            ]
+            self.rules.append((gates[0] if gates else None, phrase, replacement))
+            introduced.update(replacement)
+        self.gates: frozenset = frozenset(gate for gate, _, _ in self.rules if gate is not None)
 
-    # Handle case: benefitsQuitting
-    d: dict = {}
-    pattern_cap: str = r'[A-Z]'
-    pattern_non_cap: str = r'[a-z]'
+    def normalise(self, text: str) -> str:
+        """
+        Apply all replacement rules to the given text
+        """
+        present: set = {gate for gate in self.gates if gate in text}
+        present.add(None)
+        for gate, phrase, replacement in self.rules:
+            if gate in present:
+                text: str = text.replace(phrase, replacement)
 
-    for this_token in sentence.split(' '):
-        if re.search(r'[a-z][A-Z]', this_token):
-            temp_seq: str = re.search(r'[a-z][A-Z]', this_token).group()
-            non_cap_char: str = re.search(pattern_non_cap, temp_seq).group()
-            cap_char: str = re.search(pattern_cap, temp_seq).group()
+        return text
 
-            fixed_seq: str = f'{non_cap_char} {cap_char}'
-            d[temp_seq] = fixed_seq
 
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
+TEXT_NORMALISER: TextNormaliser = TextNormaliser(replacements=PHRASES_TO_REPLACE)
 
-    # Handle case: prohibited.Underage
-    d: dict = {}
-
-    for this_token in sentence.split(' '):
-        if re.search(r'[a-z][.][A-Z]', this_token):
-            temp_seq: str = re.search(r'[a-z][.][A-Z]', this_token).group()
-            non_cap_char: str = re.search(pattern_non_cap, temp_seq).group()
-            cap_char: str = re.search(pattern_cap, temp_seq).group()
-            fixed_seq: str = f'{non_cap_char}. {cap_char}'
-            d[temp_seq] = fixed_seq
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
-            
-    # Handle case: while?Artem 
-    d: dict = {}
-    for this_token in sentence.split(' '):
-        if re.search(r'[a-zA-Z]+[?][a-zA-Z]+', this_token):
-            temp_seq: str = re.search(r'[a-zA-Z]+[?][a-zA-Z]+', this_token).group()
-            word_1, word_2 = temp_seq.split('?')
-            fixed_seq: str = f'{word_1}? {word_2}'
-            d[temp_seq] = fixed_seq
-            
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
 
+def _token_rule(pattern: str) -> re.Pattern:
+    """
+    Compile the given pattern into a rule which finds its first match in every space separated token
+    of a sentence (the whole token is matched, the first match is available as group "hit")
+    """
+    return re.compile(r'(?<![^ ])[^ ]*?(?P<hit>' + pattern + r')[^ ]*')
+
+
+# Rules of preprocess_sentence in the order of application: (compiled rule, replaced part of the match
+# (0 for the whole token, "hit" for the first match in the token), function fixing the replaced part)
+SENTENCE_RULES: list[tuple] = [
+    # Handle cases: "e.9"
+    (_token_rule(r'[^1-9 ][.]\d+'), 0, lambda token: '{}. {}'.format(*token.split('.')[:2])),
+    # Handle case: 9Self-service
+    (_token_rule(r'\d+[a-zA-Z]'), 'hit', lambda hit: f'{hit[:-1]} {hit[-1]}'),
+    # Handle case: benefitsQuitting
+    (_token_rule(r'[a-z][A-Z]'), 'hit', lambda hit: f'{hit[0]} {hit[1]}'),
+    # Handle case: prohibited.Underage
+    (_token_rule(r'[a-z][.][A-Z]'), 'hit', lambda hit: f'{hit[0]}. {hit[2]}'),
+    # Handle case: while?Artem
+    (_token_rule(r'[a-zA-Z]+[?][a-zA-Z]+'), 'hit', lambda hit: '{}? {}'.format(*hit.split('?'))),
     # Handle case: go!Today
-    d: dict = {}
-    for this_token in sentence.split(' '):
-        if re.search(r'[a-zA-Z]+[!][a-zA-Z]+', this_token):
-            temp_seq: str = re.search(r'[a-zA-Z]+[!][a-zA-Z]+', this_token).group()
-            word_1, word_2 = temp_seq.split('!')
-            fixed_seq: str = f'{word_1}? {word_2}'
-            d[temp_seq] = fixed_seq
-            
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
-            
-    # Handle case: needed."Kirill: 
-    d: dict = {}
-        
-    for this_token in sentence.split(' '):
-        if re.search(r'[a-zA-Z]+[.][\"][a-zA-Z]+', this_token):
-            temp_seq: str = re.search(r'[a-zA-Z]+[.][\"][a-zA-Z]+', this_token).group()
-            word_1, word_2 = temp_seq.split('.')
-            fixed_seq: str = f'{word_1}. {word_2}'
-            d[temp_seq] = fixed_seq
-            
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
-            
+    (_token_rule(r'[a-zA-Z]+[!][a-zA-Z]+'), 'hit', lambda hit: '{}? {}'.format(*hit.split('!'))),
+    # Handle case: needed."Kirill:
+    (_token_rule(r'[a-zA-Z]+[.][\"][a-zA-Z]+'), 'hit', lambda hit: '{}. {}'.format(*hit.split('.'))),
     # Handle case: 2019.3
-    d: dict = {}
+    (_token_rule(r'[\d+]{4}[.][\d+]'), 'hit', lambda hit: '{}. {}'.format(*hit.split('.'))),
+    # Handle case: podcast:Introducing
+    (_token_rule(r'[a-zA-Z]+[:][a-zA-Z]+'), 'hit', lambda hit: '{}. {}'.format(*hit.split(':'))),
+    # Handle case: 200,000
+    (_token_rule(r'\d+[,]\d+'), 0, lambda token: ''.join(token.split(','))),
+]
 
-    for this_token in sentence.split(' '):
-        if re.search(r'[\d+]{4}[.][\d+]', this_token):
-            temp_seq: str = re.search(r'[\d+]{4}[.][\d+]', this_token).group()
-            digit_1, digit_2 = temp_seq.split('.')
-            fixed_seq: str = f'{digit_1}. {digit_2}'
-            d[temp_seq] = fixed_seq
 
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
+def preprocess_sentence(sentence: str) -> str:
+    """
+    Pre-process scrapped and split sentence to be readable and usable for NER.
+    Every rule collects fixes of the first match in each token and replaces them in the whole sentence.
+    """
+    for rule, part, fix in SENTENCE_RULES:
+        fixes: dict = {}
+        for this_match in rule.finditer(sentence):
+            fixes[this_match.group(part)] = fix(this_match.group(part))
+        for key, value in fixes.items():
+            sentence: str = sentence.replace(key, value)
 
-    # Handle case: podcast:Introducing
-    d: dict = {}
+    return sentence
 
-    for this_token in sentence.split(' '):
-        if re.search(r'[a-zA-Z]+[:][a-zA-Z]+', this_token):
-            temp_seq: str = re.search(r'[a-zA-Z]+[:][a-zA-Z]+', this_token).group()
-            word_1, word_2 = temp_seq.split(':')
-            fixed_seq: str = f'{word_1}. {word_2}'
-            d[temp_seq] = fixed_seq
 
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
+def preprocess_sentences(sentences: list[str]) -> list[str]:
+    """
+    Batch version of preprocess_sentence. Every rule scans all sentences at once (joined by spaces, so
+    tokens do not change) and only sentences with a match are fixed.
+    """
+    sentences: list[str] = list(sentences)
+    for rule, part, fix in SENTENCE_RULES:
+        joined: str = ' '.join(sentences)
+        matches: list = list(rule.finditer(joined))
+        if len(matches) == 0:
+            continue
+
+        offsets: list[int] = []
+        offset: int = 0
+        for this_sentence in sentences:
+            offsets.append(offset)
+            offset += len(this_sentence) + 1
 
-    # Handle case: 200,000
-    d: dict = {}
-    
-    for this_token in sentence.split(' '):
-        if re.search('\d+[,]\d+', this_token):
-            d[this_token] = ''.join(this_token.split(','))
-            
-    for key, value in d.items():
-        sentence: str = sentence.replace(key, value)
+        fixes: dict = {}
+        for this_match in matches:
+            i: int = bisect.bisect_right(offsets, this_match.start()) - 1
+            fixes.setdefault(i, {})[this_match.group(part)] = fix(this_match.group(part))
+        for i, sentence_fixes in fixes.items():
+            for key, value in sentence_fixes.items():
+                sentences[i] = sentences[i].replace(key, value)
 
-    return sentence
+    return sentences
 
 def clean_paragprah_text(paragraph_text: str) -> str:
     """
@@ -144,219 +308,56 @@ def clean_paragprah_text(paragraph_text: str) -> str:
     """
 
     paragraph_text: str = paragraph_text.strip()
-    phrases_to_remove: dict = {
-        'Linked In': 'Linkedin',
-        '\t': ' ',
-        '\n': ' ',
-        '--':'-',
-        '\ufeff': ' ',
-        "I'll ": 'I will ',
-        "I’ll": "I will",
-        "you're ": "you are ",
-        "You're": "You are",
-        "they’re": "they are",
-        "They’re": "They are",
-        "we'll ": "we will ",
-        "We'll": "We will",
-        "we'll": "we will",
-        "don't": "do not",
-        "Don't": "Do not",
-        "hasn't": "has not",
-        "Hasn't": "Has not",
-        "we've": "we have",
-        "We've": "We have",
-        "it’ll": "it will",
-        "It’ll": "It will",
-        "they’d": "they would",
-        "They’d": "They would",
-        "inaudible": "",
-        " ...": ".",
-        "(Laughs)": "",
-        "there’ll": "there will",
-        "There’ll": "There will",
-        "Can't": "Can not",
-        "can't": "can not",
-        "He’s": "He is",
-        "You’d": "You would",
-        "you’d": "you would",
-        "there’re": "there are",
-        "who’s": "who is",
-        "Who’s": "Who is",
-        "they’ve": "they have",
-        "They’ve": "They have",
-        "You'll ": "You will ",
-        "you'll": "you will",
-        "won’t": "will not",
-        "that’ll": "that will",
-        "wasn’t": "was not",
-        "he'll": "he will",
-        "He'll": "He will",
-        "She'll": "She will",
-        "didn't": "Did not ",
-        "Here’s": "Here is",
-        "we’d": "we would",
-        "We’d": "We would",
-        "you've": "you have",
-        "what's": "what is",
-        "We’re": "We are",
-        "don’t": "do not",
-        "Don’t": "Do not",
-        "you’d": "you would",
-        "didn’t": "did not",
-        "Can’t": "Can not",
-        "shouldn't": "should not",
-        "Shouldn't": "Shouldn't",
-        "What’s": "What is",
-        "hadn’t": "had not",
-        "Hadn’t": "Had not",
-        "wouldn’t": "would not",
-        "we’ve": "we have",
-        "We’ve": "We have",
-        "There’ll": "There will",
-        "weren’t": "were not",
-        "Weren’t": "Were not",
-        "can’t": "can not",
-        "we’re": "we are",
-        "I’d": "I would",
-        "shouldn’t": "should not",
-        "there’s": "there is",
-        "you’ll": "you will",
-        "You’ll": "You will",
-        "There’s": "There is",
-        "else’s": "else is",
-        "I'm ": "I am ",
-        "I’m": "I am",
-        "couldn’t": "could not",
-        "They’ll": "They will",
-        "we're": "we are",
-        "they’ll": "they will",
-        "We’ll": "We will",
-        "we’ll": "we will",
-        "he’s": "he is",
-        "doesn’t": "does not",
-        "I've": "I have",
-        "you’ve": "you have",
-        "You’ve": "You have",
-        "It's": "It is",
-        "it's ": "it is ",
-        "aren’t": "are not",
-        "Aren’t": "Are not",
-        "isn’t": "is not",
-        "what’s": "what is",
-        "haven’t": "have not",
-        "Haven’t": "Have not",
-        "it’s ": "it is ",
-        "It’s": "It is",
-        "I’ve": "I have",
-        "he’ll": "he will",
-        "He’ll": "He will",
-        "that's ": 'that is ',
-        "wasn't": "was not",
-        "isn't": "is not",
-        "Isn't": "Is not",
-        "It'd": "It would",
-        "it'd": "it would",
-        "That’s": "That is",
-        "that’s": "that is",
-        "they'll": "they will",
-        "They'll": "They will",
-        "there‘s": "there is",
-        "That's ": "That is ",
-        "he's": "he is",
-        "He's": "He is",
-        "won't": "will not",
-        "Won't": "Will not",
-        "there's ": "there is ",
-        "they're": "they are",
-        "They're": "They are",
-        "hasn’t": "has not",
-        "Hasn’t": "Has not",
-        "it’d": "it would",
-        "It’d": "It would",
-        "doesn't ": "does not",
-        "you’re": "you are",
-        "You’re": "You are",
-        "there's": "there is",
-        "There's": "There is",
-        "here’s": "here is",
-        "Here’s": "Here is",
-        "I'd": "I would",
-        "who’ve": "who have",
-        "Who’ve": "Who have",
-        "haven't": "have not",
-        "Haven't": "Have not",
-        "There’re": "There are",
-        "there’re": "there are",
-        "couldn't": "could not",
-        "Couldn't": "Could not",
-        "doesn't": "does not",
-        "Doesn't": "Does not",
-        "wouldn't": "would not",
-        "Wouldn't": "Would not",
-        "could't": "could not",
-        "Could't": "Could not",
-        "weren't": "were not",
-        "Weren't": "Were not",
-        "who's": "who is",
-        "Who's": "Who is",
-        "they've": "they have",
-        "They've": "They have",
-        "everything’s": "everything is",
-        "Everything’s": "Everything is",
-        "something’s": "something is",
-        "Something’s": "Something is",
-        "HireVue": "Hirevue",
-        "Py Torch": "PyTorch",
-        "--": "-",
-        'Podcast Transcript': '',
-        "Linked In’s": "Linkedin’s",
-        '(background music plays)': '',
-        "You Tube": "Youtube",
-        "Show allarrow_downward": "",
-        "Until then, happy analyzing.": '',
-        " ] ": "] ",
-        " . ": ". ",
-        "...": ".",
-        "…": ".",
-        "?." : "?",
-        "!." : "!",
-        "*": '',
-        '"': '',
-        '":': '',
-        "()": "",
-    }
-
-    for this_key in phrases_to_remove.keys():
-        paragraph_text: str = paragraph_text.replace(this_key, phrases_to_remove.get(this_key))
+    paragraph_text: str = TEXT_NORMALISER.normalise(text=paragraph_text)
 
     paragraph_text: str = preprocess_sentence(sentence=paragraph_text.replace('  ', ' '))
     paragraph_text: str = " ".join(paragraph_text.split()).strip()
 
     return paragraph_text
 
+
+def clean_paragprah_texts(paragraph_texts: list[str]) -> list[str]:
+    """
+    Batch version of clean_paragprah_text
+    """
+    paragraph_texts: list[str] = [
+        TEXT_NORMALISER.normalise(text=this_text.strip()).replace('  ', ' ') for this_text in paragraph_texts
+    ]
+    paragraph_texts: list[str] = preprocess_sentences(sentences=paragraph_texts)
+
+    return [" ".join(this_text.split()).strip() for this_text in paragraph_texts]
+
+# Timestamp rules of remove_timestamps in the order of precedence: name of the rule: (pattern, replacement)
+TIMESTAMP_RULES: dict = {
+    'bracketed_time': (r'\[\d[:]\d+[:]\d+\]', ''),  # [HH:MM:SS]
+    'inaudible_time': (r'\s\[[\w+]*[ ]\b\d+[:]\d+[:]\d+\]', ''),  # [inaudible HH:MM:SS]
+    'indecipherable_time': (r'\[[\w+]*\s[\d+]*[:][\d+]*\]', ''),  # [indecipherable 46:43]
+    'spaced_parenthesised_time': (r'\s[(]\d+:\d+[)]', '. '),  # \s(13:44)
+    'bracketed_time_before_capital': (r'\s\[\d+:\d+\][A-Z]', '. '),  # [33:28]Parameters
+    'spaced_bracketed_time': (r'\s\[\d+:\d+\]', ''),  # [09:07]
+    'parenthesised_time': (r'[(]\d+:\d+[)]', ''),  # (13:44)
+    'long_time': (r'\d+:\d+:\d+', ''),  # 00:24:51
+    'short_time': (r'\d+:\d+', ''),  # 18:32
+}
+TIMESTAMP_PATTERN: re.Pattern = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, (pattern, _) in TIMESTAMP_RULES.items())
+)
+
+
+def _replace_timestamp(timestamp: re.Match) -> str:
+    """
+    Replacement of the timestamp found by TIMESTAMP_PATTERN
+    """
+    return TIMESTAMP_RULES[timestamp.lastgroup][1]
+
+
 def remove_timestamps(podcast_text: str) -> str:
     """
     Remove found timestamps [HH:MM:SS] from the given podcast text and return
-    cleaned version
+    cleaned version. All timestamp rules are applied in one pass, at the same position
+    the rule listed first in TIMESTAMP_RULES wins.
     """
-    timestamp_patterns: dict = {
-        r'[[]\d[:]\d+[:]\d+[]]': '',  # [HH:MM:SS]
-        r'\s[[][\w+]*[ ]\b\d+[:]\d+[:]\d+[]]': '',  # [inaudible HH:MM:SS]
-        r'[[][\w+]*\s[\d+]*[:][\d+]*[]]': '',  # [indecipherable 46:43]
-        r'\s[(]\d+:\d+[)]': '. ',  # \s(13:44)
-        r'\s[[]\d+:\d+[]][A-Z]': '. ', # [33:28]Parameters
-        r'\s[[]\d+:\d+[]]': '', # [09:07]
-        r'[(]\d+:\d+[)]': '',  # (13:44)
-        r'\d+:\d+:\d+': '', # 00:24:51
-        r'\d+:\d+': ''  # 18:32
-    }
-
-    for this_timestamp_pattern in timestamp_patterns.keys():
-        timestamps = re.findall(this_timestamp_pattern, podcast_text)
-        if len(timestamps) > 0:
-            for this_timestamp in timestamps:
-                podcast_text: str = podcast_text.replace(this_timestamp, timestamp_patterns.get(this_timestamp_pattern))
-
+    podcast_text: str = TIMESTAMP_PATTERN.sub(_replace_timestamp, podcast_text)
     podcast_text: str = podcast_text.replace('  ', ' ')
 
     return podcast_text
@@ -0,0 +1,118 @@
+"""
+This helper file keeps an archive of raw HTML sections of fetched podcast pages, so the text cleaning
+stage can be re-run on the whole corpus without touching the network. Pages are stored as
+gzip-compressed blobs addressed by the hash of their content and an index maps URLs to blobs.
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+
+# Set-up a logger
+logging.Formatter.converter = time.gmtime
+logger = logging.getLogger(__name__)
+
+# System constansts
+INDEX_FILENAME: str = 'index.jsonl'
+BLOBS_DIRNAME: str = 'blobs'
+
+
+class RawPageArchive:
+    """
+    Content-addressed archive of raw podcast pages. Blob holds the inner HTML of the information and
+    text sections of the page, identical pages share one blob. The index is an append-only JSON Lines
+    file with URL, position of the podcast in the catalogue, catalogue record and blob hash; the last
+    line of a given URL points to its current blob.
+    """
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir: str = archive_dir
+        self.index_path: str = os.path.join(self.archive_dir, INDEX_FILENAME)
+        os.makedirs(os.path.join(self.archive_dir, BLOBS_DIRNAME), exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _blob_path(self, blob_hash: str) -> str:
+        """
+        Path of the blob with the given hash (blobs are spread over sub-folders by the hash prefix)
+        """
+        return os.path.join(self.archive_dir, BLOBS_DIRNAME, blob_hash[:2], f'{blob_hash}.json.gz')
+
+    def _write_blob(self, content: bytes) -> str:
+        """
+        Write compressed blob if it is not archived yet and return its hash
+        """
+        blob_hash: str = hashlib.sha256(content).hexdigest()
+        path: str = self._blob_path(blob_hash=blob_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path: str = f'{path}.{threading.get_ident()}.tmp'
+            with gzip.open(tmp_path, 'wb') as fh:
+                fh.write(content)
+            os.replace(tmp_path, path)
+
+        return blob_hash
+
+    def _read_blob(self, blob_hash: str) -> dict:
+        """
+        Read and decompress blob with the given hash
+        """
+        with gzip.open(self._blob_path(blob_hash=blob_hash), 'rb') as fh:
+            return json.loads(fh.read().decode('utf-8'))
+
+    def save(self, i: int, record: dict, information_html: str, html_text: str) -> str:
+        """
+        Archive raw page of the podcast (html_text is None if the podcast text was not found) and return
+        the blob hash (thread safe)
+        """
+        content: bytes = json.dumps(
+            {'information_html': information_html, 'html_text': html_text}, ensure_ascii=False
+        ).encode('utf-8')
+        blob_hash: str = self._write_blob(content=content)
+        entry: dict = {
+            'url': record['url'],
+            'position': i,
+            'record': record,
+            'blob': blob_hash,
+            'timestamp': time.strftime('%Y%m%d_%H%M%S', time.gmtime()),
+        }
+        with self._lock:
+            with open(self.index_path, 'a', encoding='utf-8') as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        return blob_hash
+
+    def load_index(self) -> dict:
+        """
+        Load current index entries keyed by URL
+        """
+        entries: dict = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as fh:
+                for this_line in fh:
+                    if this_line.strip():
+                        entry: dict = json.loads(this_line)
+                        entries[entry['url']] = entry
+
+        return entries
+
+    def iter_pages(self, urls: set = None):
+        """
+        Stream archived raw pages one by one in the index order (only pages of the given URLs if set).
+        Every page is a dict with position, record, information_html and html_text.
+        """
+        entries: dict = self.load_index()
+        logger.info(f'Raw page archive holds {len(entries)} podcast pages.')
+        for url, entry in entries.items():
+            if urls is not None and url not in urls:
+                continue
+            blob: dict = self._read_blob(blob_hash=entry['blob'])
+            yield {
+                'position': entry['position'],
+                'record': entry['record'],
+                'information_html': blob['information_html'],
+                'html_text': blob['html_text'],
+            }
@@ -0,0 +1,159 @@
+"""
+This helper file defines how the scrapper retries failed page loads: exponential backoff with jitter
+limited by a time budget per URL, and a per-host circuit breaker which pauses the whole crawl when the
+website starts failing en masse.
+"""
+
+import time
+import random
+import logging
+import threading
+from urllib.parse import urlparse
+
+# Set-up a logger
+logging.Formatter.converter = time.gmtime
+logger = logging.getLogger(__name__)
+
+# System constansts
+PERMANENT_HTTP_STATUSES: tuple = (404, 410)  # pages which will never load, no reason to retry them
+
+
+class PageLoadError(Exception):
+    """
+    Page could not be loaded within the retry policy
+    """
+
+    def __init__(self, url: str, reason: str, attempts: int):
+        super().__init__(f'{reason} after {attempts} attempt(s): {url}')
+        self.url: str = url
+        self.reason: str = reason
+        self.attempts: int = attempts
+
+
+class PermanentPageError(Exception):
+    """
+    Page returned a response which will not change on retry (e.g. HTTP 404)
+    """
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter. A URL is retried till max_retries attempts are made or the time
+    budget of the URL is spent, whichever comes first. Permanent errors are never retried.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 30,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.5,
+        time_budget: float = 300.0,
+    ):
+        self.max_retries: int = max_retries
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.jitter: float = jitter
+        self.time_budget: float = time_budget
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay in seconds before the next attempt (attempt is counted from 1)
+        """
+        delay: float = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def next_delay(self, attempt: int, started_at: float, error: Exception) -> float:
+        """
+        Return delay in seconds before the next attempt or None if the URL has to be given up
+        """
+        if isinstance(error, PermanentPageError) or attempt >= self.max_retries:
+            return None
+
+        delay: float = self.backoff(attempt=attempt)
+        if time.monotonic() - started_at + delay > self.time_budget:
+            return None
+
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Count consecutive failures per host. When failure_threshold is reached, the circuit opens and every
+    request to the host has to wait cooldown seconds. The first request after the cooldown is a probe:
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 10, cooldown: float = 120.0):
+        self.failure_threshold: int = failure_threshold
+        self.cooldown: float = cooldown
+        self._failures: dict = {}
+        self._opened_until: dict = {}
+        self._lock = threading.Lock()
+
+    def wait_time(self, url: str) -> float:
+        """
+        Seconds to wait before the given URL can be requested
+        """
+        host: str = urlparse(url).netloc
+        with self._lock:
+            return max(0.0, self._opened_until.get(host, 0.0) - time.monotonic())
+
+    def allow(self, url: str) -> bool:
+        """
+        Check if the circuit of the URL host is closed, so the URL can be requested right away
+        """
+        return self.wait_time(url=url) == 0.0
+
+    def record_success(self, url: str) -> None:
+        """
+        Close the circuit of the URL host
+        """
+        host: str = urlparse(url).netloc
+        with self._lock:
+            self._failures[host] = 0
+
+        return None
+
+    def record_failure(self, url: str) -> None:
+        """
+        Register failed request and open the circuit of the URL host if too many requests failed in a row
+        """
+        host: str = urlparse(url).netloc
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.failure_threshold:
+                self._opened_until[host] = time.monotonic() + self.cooldown
+                logger.warning(
+                    f'{self._failures[host]} failures in a row on {host}, crawl is paused for {self.cooldown} seconds.'
+                )
+
+        return None
+
+
+def check_response_status(status: int) -> None:
+    """
+    Raise PermanentPageError if the HTTP status of the loaded page will not change on retry and
+    ConnectionError if the server is overloaded or failing (the page has to be retried)
+    """
+    if status in PERMANENT_HTTP_STATUSES:
+        raise PermanentPageError(f'HTTP {status}')
+    if status == 429 or status >= 500:
+        raise ConnectionError(f'HTTP {status}')
+
+    return None
+
+
+def describe_error(error: Exception) -> str:
+    """
+    Short failure reason of the given page load error, timeouts are distinguished from other errors
+    """
+    if isinstance(error, PageLoadError):
+        return error.reason
+    if isinstance(error, PermanentPageError):
+        return str(error)
+    if type(error).__name__ == 'TimeoutError':  # both built-in and Playwright timeouts
+        return 'timeout'
+
+    return f'{type(error).__name__}: {str(error).splitlines()[0] if str(error) else ""}'.strip()
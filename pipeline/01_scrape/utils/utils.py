@@ -6,9 +6,8 @@ required actions.
 import time
 import logging
 import requests
-import os
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-import json
 
 # Set-up a logger
 logging.Formatter.converter = time.gmtime
@@ -31,11 +30,24 @@ MTH_DICT: dict = {
 }
 
 
-def prepare_page_for_scrapping(page_url: str) -> BeautifulSoup:
+def build_http_session(pool_size: int = 10) -> requests.Session:
+    """
+    Build HTTP session which keeps connections alive and shares them between concurrent requests
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def prepare_page_for_scrapping(page_url: str, session: requests.Session = None, timeout: int = 25) -> BeautifulSoup:
     """
     Build a BeautifulSoup object which will be suitable for scrapping data by a given webpage url address
     """
-    r = requests.get(page_url)
+    r = (session or requests).get(page_url, timeout=timeout)
+    r.raise_for_status()
     c = r.content
     return BeautifulSoup(c, 'html.parser')
 
@@ -52,14 +64,14 @@ def block_aggressively(route, request, excluded_resource_types=["image", "images
         route.continue_()
 
 
-def save_to_json(data: dict, filename: str) -> None:
+async def block_aggressively_async(route, request, excluded_resource_types=["image", "images"]):
     """
-    Save a given list with data to JSON file
+    Asynchronous version of block_aggressively for the playwright async API
     """
-    data_folder: str = 'output'
-    with open(os.path.join(os.getcwd(), data_folder, filename), "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-    logger.info('JSON output is saved successfully.')
+    if request.resource_type in excluded_resource_types:
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 def error_msg_load_page(url: str, max_retries: str) -> None:
@@ -71,30 +83,6 @@ def error_msg_load_page(url: str, max_retries: str) -> None:
     logger.error('-'*20)
 
 
-def generate_scrapped_podcast_filename(title: str, number: str, date: str) -> str:
-    """
-    Clean a given raw filename string and return generated version of that
-    """
-    filename: str = f'{date}_{number.replace(" ", "_").lower()}_{title.lower().split(":")[-1].replace(" ", "_")}.json'
-
-    rules_to_clean: dict = {
-        " ": "_",
-        '/': '_',
-        ',': '',
-        '”': '',
-        '%': '',
-        '!': '',
-        '"': '',
-        '?': '',
-        '__': '_',
-        'www.': '',
-    }
-
-    for this_key in rules_to_clean.keys():
-        filename: str = filename.replace(this_key, rules_to_clean.get(this_key))
-
-    return filename
-
 def parse_date(date_string: str) -> str:
     """
     Transform original date string (Saturday Sep 10, 2016) to format YYYYMMDD
@@ -5,23 +5,33 @@ save them into new vector database (ChromaDB)
 
 # Import packages and modules
 import os
+import time
 import logging
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import configparser
 from tqdm.auto import tqdm
 from dotenv import load_dotenv
 from spacy.lang.en import English
 import chromadb
-from langchain_community.vectorstores import Chroma
-from langchain.embeddings import SentenceTransformerEmbeddings
 import chromadb.utils.embedding_functions as embedding_functions
 from load_huggingface_info import load_hugging_face_creds
+from embedding_cache import EmbeddingCache
+from embedding_backends import get_embeddings, EMBEDDING_BACKENDS
 from utils import (
-    get_file_list,
-    read_single_json,
+    read_jsonl_batches,
+    get_normalised_text_hash,
+    get_url_preference,
+    get_chunk_id,
+    split_sentence_spans,
     get_current_date_and_time,
+    find_latest_database,
     preprocess_sentence,
-    valid_sentence,
-    split_text,
+    BoilerplateFilter,
+    iter_chunks,
+    TokenChunker,
+    pack_sentences,
 )
 
 # Load config and environment
@@ -51,6 +61,35 @@ CHUNK_SIZE: int = int(conf["llm_parameters"]["CHUNK_SIZE"])  # Tokens
 L: int = int(conf["llm_parameters"]["LENGHT_OF_SENTENCE"])  # Length of sentence allowed
 EMBEDDING_FUNCTION: str = conf["llm_parameters"]["EMBEDDING_FUNCTION"]
 EMBEDDING_MODEL: str = conf["llm_parameters"]["EMBEDDING_MODEL"]
+EMBEDDING_BACKEND: str = conf["embedding"]["EMBEDDING_BACKEND"]  # torch, onnx or onnx-int8
+ONNX_MODEL_DIR: str = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", conf["embedding"]["ONNX_MODEL_DIR"])
+)  # exported ONNX models (see embedding_backend_check.py --export)
+EMBED_BATCH_SIZE: int = int(conf["embedding"]["EMBED_BATCH_SIZE"])  # chunks encoded at once by the model
+EMBED_STAGE_SIZE: int = int(conf["embedding"]["EMBED_STAGE_SIZE"])  # chunks gathered before embedding
+EMBED_WORKERS: int = int(conf["embedding"]["EMBED_WORKERS"])  # embedding processes (1 means in-process)
+EMBED_SHARD_SIZE: int = int(conf["embedding"]["EMBED_SHARD_SIZE"])  # chunks sent to a worker at once
+INSERT_BATCH_SIZE: int = 5000  # chunks inserted at once (below the ChromaDB limit)
+EMBEDDING_CACHE_DIR: str = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "embedding_cache")
+)  # embeddings of already embedded chunks, namespaced by the embedding model
+COLLECTION_NAME: str = "langchain"  # default collection of the langchain Chroma used by retrieval
+CORPUS_PATH: str = "../01_scrape/output/corpus.jsonl"  # written by the scrapper
+CORPUS_BATCH_SIZE: int = 64  # podcast records loaded at once
+CHUNKING_MODES: tuple = ("words", "tokens", "sentences")  # words, model tokens or whole sentences
+CHUNKING_MODE: str = conf["chunking"]["CHUNKING_MODE"]
+TOKEN_CHUNK_SIZE: int = int(conf["chunking"]["TOKEN_CHUNK_SIZE"])  # model tokens (without special tokens)
+TOKEN_CHUNK_OVERLAP: int = int(conf["chunking"]["TOKEN_CHUNK_OVERLAP"])  # model tokens
+SENTENCE_CHUNK_OVERLAP: int = int(conf["chunking"]["SENTENCE_CHUNK_OVERLAP"])  # sentences
+SENTENCE_SPLITTERS: tuple = ("spacy", "regex")  # available sentence splitters
+SENTENCE_SPLITTER: str = conf["chunking"]["SENTENCE_SPLITTER"]
+NLP_BATCH_SIZE: int = int(conf["chunking"]["NLP_BATCH_SIZE"])  # texts per spaCy batch
+NLP_N_PROCESS: int = int(conf["chunking"]["NLP_N_PROCESS"])  # spaCy processes (-1 means all cores)
+BOILERPLATE_PHRASES: list = [
+    this_phrase.strip()
+    for this_phrase in conf["chunking"]["BOILERPLATE_PHRASES"].splitlines()
+    if this_phrase.strip()
+]  # sentences with these phrases are not pushed to vectordb
 
 
 class ChunkingAndSaving:
@@ -66,38 +105,216 @@ class ChunkingAndSaving:
         chunk_size: int = CHUNK_SIZE,
         embedding_function: str = EMBEDDING_FUNCTION,
         embedding_model: str = EMBEDDING_MODEL,
+        embedding_backend: str = EMBEDDING_BACKEND,
+        sentence_splitter: str = SENTENCE_SPLITTER,
+        nlp_batch_size: int = NLP_BATCH_SIZE,
+        nlp_n_process: int = NLP_N_PROCESS,
+        boilerplate_phrases: list = BOILERPLATE_PHRASES,
+        chunking_mode: str = CHUNKING_MODE,
     ):
         self.vectordb_name: str = db_name
         self.chunks_overlap: int = chunks_overlap
         self.chunk_size: int = chunk_size
         self.embedding_function: str = embedding_function
         self.embedding_model: str = embedding_model
+        self.embedding_backend: str = embedding_backend
+        self.sentence_splitter: str = sentence_splitter
+        self.nlp_batch_size: int = nlp_batch_size
+        self.nlp_n_process: int = nlp_n_process
+        self.chunking_mode: str = chunking_mode
+        self.token_chunker: TokenChunker = None
+        if self.chunking_mode == "tokens":
+            self.token_chunker = TokenChunker(
+                model_name=f"sentence-transformers/{self.embedding_model}",
+                chunk_size=TOKEN_CHUNK_SIZE,
+                chunk_overlap=TOKEN_CHUNK_OVERLAP,
+            )
+        self.boilerplate_filter: BoilerplateFilter = BoilerplateFilter(
+            phrases=boilerplate_phrases, min_sentence_length=L
+        )
 
         # Add sentencizer pipeline
         self.nlp = English()
         self.nlp.add_pipe("sentencizer")
 
-    def load_all_jsons(self, path: str, extension: str) -> list[dict]:
+    def load_corpus(self, path: str, batch_size: int = CORPUS_BATCH_SIZE):
         """
-        Find and load all scrapped JSON files with podcast texts
+        Stream scrapped podcast records from the corpus in batches. The corpus is append-only, so only
+        the last record of every URL is kept (it supersedes records of a scrapping run which was not
+        compacted). Of mirrored episodes (same normalised text under another URL, e.g. sds- and
+        podcast- URLs of one episode) only the URL preferred by get_url_preference is kept, whatever
+        the order of the records. The corpus is read twice: the first pass picks the records to keep,
+        the second one streams them.
         """
+        last_position_of_url: dict = {}
+        text_hash_of_url: dict = {}
+        n_records: int = 0
+        for this_batch in read_jsonl_batches(path=path, batch_size=batch_size):
+            for this_record in this_batch:
+                last_position_of_url[this_record["url"]] = n_records
+                text_hash_of_url[this_record["url"]] = get_normalised_text_hash(text=this_record["full_text"])
+                n_records += 1
+
+        url_of_text_hash: dict = {}
+        for url, text_hash in text_hash_of_url.items():
+            kept_url: str = url_of_text_hash.get(text_hash)
+            if kept_url is None or get_url_preference(url=url) < get_url_preference(url=kept_url):
+                url_of_text_hash[text_hash] = url
+        for url, text_hash in text_hash_of_url.items():
+            if url_of_text_hash[text_hash] != url:
+                logger.info(f"Skipping mirrored episode: {url}")
+        kept_positions: set = {last_position_of_url[url] for url in url_of_text_hash.values()}
+
+        position: int = 0
+        for this_batch in read_jsonl_batches(path=path, batch_size=batch_size):
+            new_records: list[dict] = []
+            for this_record in this_batch:
+                if position in kept_positions:
+                    new_records.append(this_record)
+                position += 1
+
+            if len(new_records) > 0:
+                yield new_records
+
+        logger.info(
+            f"Corpus is loaded with {len(kept_positions)} podcasts, skipped duplicates: "
+            f"{n_records - len(last_position_of_url)} by URL, "
+            f"{len(last_position_of_url) - len(kept_positions)} by text"
+        )
 
-        l_urls: list = []
-        json_files: list[dict] = get_file_list(root_dir=path, E=extension)
-        if len(json_files) > 0:
-            l_jsons: list[dict] = []
-            for this_file in json_files:
-                if this_file.endswith(extension):
-                    data_file: dict = read_single_json(path=this_file)
-                    url: str = data_file["url"]
-                    if url not in l_urls:
-                        l_urls.append(url)
-                        l_jsons.append(data_file)
-
-            return l_jsons
-        else:
+    def iter_split_records(self, records):
+        """
+        Split texts of the given stream of podcast records into sentences and yield (record, sentences,
+        sentence_spans) triples, sentence_spans are (start, end) character offsets of the sentences in
+        the record full_text. spaCy processes the whole stream with nlp.pipe in batches (in several
+        processes if configured), the regex splitter can be used when exact spaCy parity is not required.
+        """
+        if self.sentence_splitter == "regex":
+            for this_record in records:
+                text: str = this_record["full_text"]
+                sentence_spans: list = split_sentence_spans(text=text)
+                yield this_record, [text[start:end] for start, end in sentence_spans], sentence_spans
             return None
 
+        docs = self.nlp.pipe(
+            ((this_record["full_text"], this_record) for this_record in records),
+            as_tuples=True,
+            batch_size=self.nlp_batch_size,
+            n_process=self.nlp_n_process,
+        )
+        for doc, this_record in docs:
+            yield (
+                this_record,
+                [str(this_sentence) for this_sentence in doc.sents],
+                [(this_sentence.start_char, this_sentence.end_char) for this_sentence in doc.sents],
+            )
+
+    def valid_sentences(self, sentences: list, sentence_spans: list) -> tuple:
+        """
+        Return pre-processed sentences which are valid to be pushed to vectordb (not boilerplate and long
+        enough), their source offsets and breaks: positions of the valid sentences which follow a dropped
+        sentence (such sentences are not adjacent to the previous valid one in the source text)
+        """
+        sentences = [preprocess_sentence(sentence=this_sentence) for this_sentence in sentences]
+        mask, _ = self.boilerplate_filter.keep_mask(sentences=sentences)
+
+        breaks: set = set()
+        n_kept: int = 0
+        for i, keep in enumerate(mask):
+            if keep:
+                if n_kept > 0 and not mask[i - 1]:
+                    breaks.add(n_kept)
+                n_kept += 1
+
+        return (
+            [this_sentence for this_sentence, keep in zip(sentences, mask) if keep],
+            [this_span for this_span, keep in zip(sentence_spans, mask) if keep],
+            breaks,
+        )
+
+    def chunk_sentences(self, sentences: list, sentence_spans: list = None, breaks: set = None) -> tuple:
+        """
+        Chunk the given valid sentences according to the chunking mode: by whitespace words (chunk_size
+        words), by tokens of the embedding model (TOKEN_CHUNK_SIZE tokens) or by whole sentences (up to
+        chunk_size words, overlapping by SENTENCE_CHUNK_OVERLAP sentences). Chunk texts are built right
+        away by joining their pre-processed sentences with single spaces (they are hashed into chunk IDs
+        before embedding). Return the chunks and, in the sentences mode, (start, end) character offsets
+        of the chunks in the record full_text (spanning their first and last sentence, given by
+        sentence_spans), None otherwise. In the sentences mode a chunk never crosses breaks (see
+        valid_sentences), so full_text[start:end] is the raw source passage of the chunk sentences with
+        nothing filtered out in between. It is not the embedded text: preprocess_sentence rewrites some
+        phrases (".:", "Py Torch") and sentences are re-joined with single spaces.
+        """
+        if self.chunking_mode == "sentences":
+            sentence_ranges: list = pack_sentences(
+                sentence_sizes=[len(this_sentence.split()) for this_sentence in sentences],
+                chunk_size=self.chunk_size,
+                sentence_overlap=SENTENCE_CHUNK_OVERLAP,
+                breaks=breaks,
+            )
+            chunks: list = [" ".join(sentences[first:last + 1]) for first, last in sentence_ranges]
+            if sentence_spans is None:
+                return chunks, None
+
+            chunk_spans: list = [
+                (sentence_spans[first][0], sentence_spans[last][1]) for first, last in sentence_ranges
+            ]
+
+            return chunks, chunk_spans
+
+        if self.chunking_mode == "tokens":
+            return self.token_chunker.split_texts(texts=[" ".join(sentences)])[0], None
+
+        chunks: list = list(
+            iter_chunks(
+                tokens=(this_word for this_sentence in sentences for this_word in this_sentence.split()),
+                chunk_overlap=self.chunks_overlap,
+                chunk_size=self.chunk_size,
+            )
+        )
+
+        return chunks, None
+
+    def chunk_episodes(self, sentence_lists: list, span_lists: list, break_lists: list) -> list:
+        """
+        Chunk valid sentences of a batch of episodes, return (chunks, chunk_spans) of every episode (see
+        chunk_sentences). In the tokens mode, texts of the whole batch are encoded by the fast tokenizer
+        in one call.
+        """
+        if self.chunking_mode == "tokens":
+            texts: list = [" ".join(this_sentences) for this_sentences in sentence_lists]
+            return [(chunks, None) for chunks in self.token_chunker.split_texts(texts=texts)]
+
+        return [
+            self.chunk_sentences(sentences=this_sentences, sentence_spans=this_spans, breaks=this_breaks)
+            for this_sentences, this_spans, this_breaks in zip(sentence_lists, span_lists, break_lists)
+        ]
+
+    def iter_chunked_records(self, records):
+        """
+        Split, filter and chunk the given stream of podcast records in batches of nlp_batch_size
+        episodes, yield (record, chunks, chunk_spans) of every episode
+        """
+        split_records = self.iter_split_records(records=records)
+        while True:
+            batch: list = list(itertools.islice(split_records, self.nlp_batch_size))
+            if len(batch) == 0:
+                break
+
+            valid: list = [
+                self.valid_sentences(sentences=sentences, sentence_spans=sentence_spans)
+                for _, sentences, sentence_spans in batch
+            ]
+            for (this_record, _, _), (chunks, chunk_spans) in zip(
+                batch,
+                self.chunk_episodes(
+                    sentence_lists=[sentences for sentences, _, _ in valid],
+                    span_lists=[sentence_spans for _, sentence_spans, _ in valid],
+                    break_lists=[breaks for _, _, breaks in valid],
+                ),
+            ):
+                yield this_record, chunks, chunk_spans
+
     def connect_to_hugging_face(self):
         """
         Load ensembling model from HuggingFace
@@ -111,74 +328,444 @@ class ChunkingAndSaving:
         )
         # Use these credentials on demand if needed
 
-        embeddings = SentenceTransformerEmbeddings(model_name=self.embedding_model)
+        embeddings = get_embeddings(
+            backend=self.embedding_backend,
+            model_name=self.embedding_model,
+            onnx_dir=ONNX_MODEL_DIR,
+            batch_size=EMBED_BATCH_SIZE,
+        )
 
         return embeddings
 
 
-def main():
+# Embedding model of an embedding worker process (created by the process pool initializer)
+_worker_embeddings = None
+
+
+def _init_embedding_worker(model_name: str, backend: str, n_threads: int) -> None:
     """
-    Run chunking and saving to vectordb pipeline
+    Process pool initializer of the sharded embedding mode: load own copy of the embedding model and
+    limit its intra-op threads, so the workers do not oversubscribe the CPU cores
     """
+    global _worker_embeddings
+    if backend == "torch":
+        import torch
+
+        torch.set_num_threads(n_threads)
+    _worker_embeddings = get_embeddings(
+        backend=backend,
+        model_name=model_name,
+        onnx_dir=ONNX_MODEL_DIR,
+        batch_size=EMBED_BATCH_SIZE,
+        n_threads=n_threads,
+    )
 
-    job = ChunkingAndSaving()
+    return None
 
-    # Load scrapped data
-    text_with_data: list[dict] = job.load_all_jsons(
-        path="../01_scrape/output", extension=".json"
-    )
 
-    # Initialize VectorDB
-    logger.info(f"Initializing VectorDB")
-    db_path: str = os.path.join(
-        os.path.abspath(
-            os.path.join(
-                os.path.dirname(__file__),
-                "..",
-                "vector_dbs",
+def _embed_shard(texts: list) -> list:
+    """
+    Embed a shard of chunk texts in an embedding worker process
+    """
+    return _worker_embeddings.embed_documents(texts)
+
+
+def get_collection_metadata(embedding_model: str, embedding_backend: str) -> dict:
+    """
+    Metadata of the vectordb collection: embedding model and backend which built its vectors
+    """
+    return {"embedding_model": embedding_model, "embedding_backend": embedding_backend}
+
+
+class EmbeddingStage:
+    """
+    Gather chunks across episodes, embed every unique chunk text once in large length-sorted batches
+    and bulk insert the chunks with their precomputed embeddings to the vectordb collection. Chunks
+    found in the embedding cache (if given) are not embedded again.
+    """
+
+    def __init__(
+        self,
+        collection,
+        embeddings,
+        stage_size: int = EMBED_STAGE_SIZE,
+        cache: EmbeddingCache = None,
+        embed_workers: int = 1,
+        model_name: str = EMBEDDING_MODEL,
+        backend: str = EMBEDDING_BACKEND,
+    ):
+        self.collection = collection
+        self.embeddings = embeddings
+        self.cache: EmbeddingCache = cache
+        self.embed_workers: int = embed_workers
+        self.executor: ProcessPoolExecutor = None
+        if embed_workers > 1:
+            self.executor = ProcessPoolExecutor(
+                max_workers=embed_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_embedding_worker,
+                initargs=(model_name, backend, max(1, (os.cpu_count() or 1) // embed_workers)),
             )
-        ),
-        DATABASE_NAME,
-    )
+        self.stage_size: int = stage_size
+        self.ids: list = []
+        self.texts: list = []
+        self.metadatas: list = []
+        self.n_chunks: int = 0
+        self.n_embedded: int = 0
+        self.n_cached: int = 0
+        self.embedding_time: float = 0.0
+        self.started_at: float = time.perf_counter()
+
+    def add(self, ids: list, texts: list, metadatas: list) -> None:
+        """
+        Queue chunks with their IDs and metadata, embed and insert the queue once it is large enough
+        """
+        self.ids.extend(ids)
+        self.texts.extend(texts)
+        self.metadatas.extend(metadatas)
+        if len(self.texts) >= self.stage_size:
+            self.flush()
 
-    vector_db = Chroma(
-        persist_directory=db_path,
-        embedding_function=job.connect_to_hugging_face(),
-    )
+        return None
 
-    for this_collection in tqdm(text_with_data):
-        full_text: str = this_collection["full_text"]
+    def embed(self, texts: list) -> list:
+        """
+        Embed the given chunk texts in this process or, in the sharded mode, split them into shards
+        embedded by the worker processes and gather the vectors in the original order
+        """
+        if len(texts) == 0:
+            return []
+        if self.executor is None:
+            return self.embeddings.embed_documents(texts)
 
-        # 1. Split text to sentences
-        sentences: list = list(job.nlp(full_text).sents)
+        shards: list = [
+            texts[start:start + EMBED_SHARD_SIZE] for start in range(0, len(texts), EMBED_SHARD_SIZE)
+        ]
 
-        full_text_l: list = []
-        for this_sentence in sentences:
-            sentence: str = preprocess_sentence(sentence=str(this_sentence))
-            if valid_sentence(sentence=sentence, allowed_sentence_lenght=L):
-                full_text_l.append(sentence)
-            full_text_joined: str = " ".join(full_text_l)
+        return list(itertools.chain.from_iterable(self.executor.map(_embed_shard, shards)))
+
+    def close(self) -> None:
+        """
+        Stop the embedding worker processes (shards which are not started yet are cancelled)
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
 
-        collection_name: str = this_collection["title"][0:61]
-        if collection_name.endswith("-"):
-            collection_name = collection_name[: len(collection_name) - 1]
-        collection_name: str = collection_name.replace("-", "_")
+        return None
 
-        chunks: list = split_text(
-            text=full_text_joined,
-            chunk_overlap=job.chunks_overlap,
-            chunk_size=job.chunk_size,
+    def flush(self) -> None:
+        """
+        Embed unique queued chunk texts (sorted by length, so batches are not padded to the longest
+        chunk of a random mix) and insert all queued chunks to the collection
+        """
+        if len(self.texts) == 0:
+            return None
+
+        unique_texts: list = sorted(set(self.texts), key=len)
+        vector_of_text: dict = {}
+        if self.cache is not None:
+            for this_text, this_vector in zip(unique_texts, self.cache.get_many(texts=unique_texts)):
+                if this_vector is not None:
+                    vector_of_text[this_text] = this_vector
+        texts_to_embed: list = [this_text for this_text in unique_texts if this_text not in vector_of_text]
+
+        started_at: float = time.perf_counter()
+        vectors: list = self.embed(texts=texts_to_embed)
+        self.embedding_time += time.perf_counter() - started_at
+        vector_of_text.update(zip(texts_to_embed, vectors))
+        if self.cache is not None:
+            self.cache.put_many(texts=texts_to_embed, vectors=vectors)
+
+        for start in range(0, len(self.texts), INSERT_BATCH_SIZE):
+            texts: list = self.texts[start:start + INSERT_BATCH_SIZE]
+            self.collection.add(
+                ids=self.ids[start:start + INSERT_BATCH_SIZE],
+                embeddings=[vector_of_text[this_text] for this_text in texts],
+                documents=texts,
+                metadatas=self.metadatas[start:start + INSERT_BATCH_SIZE],
+            )
+
+        logger.info(
+            f"{len(self.texts)} chunks ({len(unique_texts)} unique, {len(texts_to_embed)} embedded) "
+            "are pushed to the vector database"
+        )
+        self.n_chunks += len(self.texts)
+        self.n_embedded += len(texts_to_embed)
+        self.n_cached += len(unique_texts) - len(texts_to_embed)
+        self.ids = []
+        self.texts = []
+        self.metadatas = []
+
+        return None
+
+    def report(self) -> str:
+        """
+        Indexing throughput of the stage
+        """
+        total_time: float = time.perf_counter() - self.started_at
+
+        return (
+            f"Indexed {self.n_chunks} chunks ({self.n_embedded} embedded, {self.n_cached} from cache) "
+            f"in {total_time:.1f} s with {self.embed_workers} embedding worker(s): "
+            f"{self.n_chunks / max(total_time, 1e-9):.1f} chunks/sec overall, "
+            f"{self.n_embedded / max(self.embedding_time, 1e-9):.1f} chunks/sec embedding"
         )
-        metadata: list = [{"source": this_collection["title"]} for name in chunks]
 
-        logger.info(f"Pushing the document to the vector database: {collection_name}")
 
-        vector_db.add_texts(
-            texts=chunks, metadatas=metadata, collection_name=collection_name
+class IncrementalIndex:
+    """
+    Keep an existing vectordb collection in sync with the corpus: chunks are identified by deterministic
+    IDs, so only new chunks are inserted, chunks of changed episodes which are gone are deleted and
+    chunks of removed episodes are deleted at the end. Unchanged chunks are left untouched, only their
+    metadata (title, source offsets) is updated if it changed. Unchanged chunks are not embedded again,
+    so the collection has to be built by the same embedding model and backend (stored in the collection
+    metadata).
+    """
+
+    def __init__(
+        self,
+        collection,
+        embedding_model: str = EMBEDDING_MODEL,
+        embedding_backend: str = EMBEDDING_BACKEND,
+    ):
+        self.collection = collection
+        self.ids_of_url: dict = {}
+        self.metadata_of_id: dict = {}
+        collection_metadata: dict = get_collection_metadata(
+            embedding_model=embedding_model, embedding_backend=embedding_backend
         )
+        if collection.count() == 0:
+            # Nothing is embedded yet, the collection is taken over by the current model and backend
+            collection.modify(metadata=collection_metadata)
+        elif any(
+            (collection.metadata or {}).get(this_key) != this_value
+            for this_key, this_value in collection_metadata.items()
+        ):
+            # Vectors of different models (or backends) would be mixed in one collection
+            stored_metadata: dict = collection.metadata or {}
+            raise RuntimeError(
+                f"Vector database is built with {stored_metadata.get('embedding_model')} "
+                f"({stored_metadata.get('embedding_backend')} backend), not with {embedding_model} "
+                f"({embedding_backend} backend), rebuild it without --upsert"
+            )
+        existing: dict = collection.get(include=["metadatas"])
+        n_without_url: int = 0
+        for this_id, this_metadata in zip(existing["ids"], existing["metadatas"]):
+            url: str = (this_metadata or {}).get("url")
+            if url is None:
+                n_without_url += 1
+            else:
+                self.ids_of_url.setdefault(url, set()).add(this_id)
+                self.metadata_of_id[this_id] = this_metadata
+        if n_without_url > 0:
+            # Such chunks can not be matched to episodes, the whole corpus would be inserted next to them
+            raise RuntimeError(
+                f"Vector database holds {n_without_url} chunks without url metadata (built before "
+                f"incremental updates), rebuild it without --upsert"
+            )
+        self.seen_urls: set = set()
+        self.n_unchanged: int = 0
+        self.n_updated: int = 0
+        self.n_deleted: int = 0
+        logger.info(f"Existing vector database holds chunks of {len(self.ids_of_url)} episodes.")
+
+    def _delete(self, ids: list) -> None:
+        """
+        Delete chunks with the given IDs from the collection
+        """
+        for start in range(0, len(ids), INSERT_BATCH_SIZE):
+            self.collection.delete(ids=ids[start:start + INSERT_BATCH_SIZE])
+        self.n_deleted += len(ids)
+
+        return None
+
+    def _update_metadata(self, ids: list, metadatas: list) -> None:
+        """
+        Replace metadata of stored chunks with the given IDs (keys missing in the new metadata are removed)
+        """
+        metadatas = [
+            {
+                **dict.fromkeys(set(self.metadata_of_id[this_id]).difference(this_metadata)),
+                **this_metadata,
+            }
+            for this_id, this_metadata in zip(ids, metadatas)
+        ]
+        for start in range(0, len(ids), INSERT_BATCH_SIZE):
+            self.collection.update(
+                ids=ids[start:start + INSERT_BATCH_SIZE], metadatas=metadatas[start:start + INSERT_BATCH_SIZE]
+            )
+        self.n_updated += len(ids)
+
+        return None
+
+    def sync_episode(self, url: str, ids: list, metadatas: list) -> list:
+        """
+        Delete stored chunks of the episode which are not among its current chunk IDs, update metadata of
+        stored chunks which differs from the current one (e.g. the title or source offsets changed while
+        the chunk text did not) and return mask of current chunks which have to be inserted
+        """
+        self.seen_urls.add(url)
+        existing_ids: set = self.ids_of_url.get(url, set())
+        stale_ids: list = sorted(existing_ids.difference(ids))
+        if len(stale_ids) > 0:
+            self._delete(ids=stale_ids)
+
+        changed: list = [
+            (this_id, this_metadata)
+            for this_id, this_metadata in zip(ids, metadatas)
+            if this_id in existing_ids and self.metadata_of_id[this_id] != this_metadata
+        ]
+        if len(changed) > 0:
+            self._update_metadata(
+                ids=[this_id for this_id, _ in changed],
+                metadatas=[this_metadata for _, this_metadata in changed],
+            )
+        self.n_unchanged += len(existing_ids) - len(stale_ids) - len(changed)
 
-    vector_db.persist()
+        return [this_id not in existing_ids for this_id in ids]
 
+    def delete_removed_episodes(self) -> None:
+        """
+        Delete chunks of episodes which are not in the corpus anymore
+        """
+        for url, ids in self.ids_of_url.items():
+            if url not in self.seen_urls:
+                self._delete(ids=sorted(ids))
+
+        return None
+
+    def report(self) -> str:
+        """
+        Summary of the incremental update
+        """
+        return (
+            f"Unchanged chunks: {self.n_unchanged}, chunks with updated metadata: {self.n_updated}, "
+            f"deleted chunks: {self.n_deleted}"
+        )
+
+
+def main(
+    sentence_splitter: str = SENTENCE_SPLITTER,
+    nlp_n_process: int = NLP_N_PROCESS,
+    chunking_mode: str = CHUNKING_MODE,
+    use_embedding_cache: bool = True,
+    upsert: bool = False,
+    embed_workers: int = EMBED_WORKERS,
+    embedding_backend: str = EMBEDDING_BACKEND,
+):
+    """
+    Run chunking and saving to vectordb pipeline
+    """
+
+    job = ChunkingAndSaving(
+        sentence_splitter=sentence_splitter,
+        nlp_n_process=nlp_n_process,
+        chunking_mode=chunking_mode,
+        embedding_backend=embedding_backend,
+    )
+
+    # Initialize VectorDB (the latest existing one in upsert mode)
+    logger.info(f"Initializing VectorDB")
+    db_dir: str = os.path.abspath(
+        os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "vector_dbs",
+        )
+    )
+    db_path: str = find_latest_database(db_dir=db_dir) if upsert else None
+    if db_path is None:
+        db_path = os.path.join(db_dir, DATABASE_NAME)
+    logger.info(f"Vector database: {db_path}")
+
+    client = chromadb.PersistentClient(path=db_path)
+    incremental_index: IncrementalIndex = None
+    if upsert:
+        # Metadata of an existing collection is kept, so IncrementalIndex can check its embedding model
+        collection = client.get_or_create_collection(name=COLLECTION_NAME)
+        incremental_index = IncrementalIndex(
+            collection=collection,
+            embedding_model=job.embedding_model,
+            embedding_backend=job.embedding_backend,
+        )
+    else:
+        collection = client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            metadata=get_collection_metadata(
+                embedding_model=job.embedding_model, embedding_backend=job.embedding_backend
+            ),
+        )
+    embedding_stage = EmbeddingStage(
+        collection=collection,
+        # Worker processes of the sharded mode load their own models
+        embeddings=job.connect_to_hugging_face() if embed_workers <= 1 else None,
+        # Vectors of different backends differ slightly, so every backend has its own cache
+        cache=EmbeddingCache(
+            cache_dir=EMBEDDING_CACHE_DIR,
+            model_name=job.embedding_model
+            if job.embedding_backend == "torch"
+            else f"{job.embedding_model}-{job.embedding_backend}",
+        )
+        if use_embedding_cache
+        else None,
+        embed_workers=embed_workers,
+        model_name=job.embedding_model,
+        backend=job.embedding_backend,
+    )
+
+    # The embedding worker processes are stopped even if chunking or inserting fails
+    try:
+        # Load scrapped data in batches and split texts of the whole corpus to sentences
+        records = (
+            this_record
+            for text_with_data in job.load_corpus(path=CORPUS_PATH)
+            for this_record in text_with_data
+        )
+        # 1.-2. Keep the valid sentences and chunk them (a batch of episodes at once)
+        for this_collection, chunks, chunk_spans in tqdm(job.iter_chunked_records(records=records)):
+            collection_name: str = this_collection["title"][0:61]
+            if collection_name.endswith("-"):
+                collection_name = collection_name[: len(collection_name) - 1]
+            collection_name: str = collection_name.replace("-", "_")
+
+            metadata: list = [
+                {"source": this_collection["title"], "url": this_collection["url"]} for name in chunks
+            ]
+            if chunk_spans is not None:
+                # Raw source passage of the chunk: full_text[start:end] of the scrapped record
+                for this_metadata, (start, end) in zip(metadata, chunk_spans):
+                    this_metadata.update({"start": start, "end": end})
+            ids: list = [
+                get_chunk_id(url=this_collection["url"], index=i, text=this_chunk)
+                for i, this_chunk in enumerate(chunks)
+            ]
+
+            if incremental_index is not None:
+                # 3. Keep only chunks which are not stored yet
+                to_insert: list = incremental_index.sync_episode(
+                    url=this_collection["url"], ids=ids, metadatas=metadata
+                )
+                ids = [this_id for this_id, keep in zip(ids, to_insert) if keep]
+                chunks = [this_chunk for this_chunk, keep in zip(chunks, to_insert) if keep]
+                metadata = [this_metadata for this_metadata, keep in zip(metadata, to_insert) if keep]
+
+            logger.info(f"Queueing the document for the vector database: {collection_name}")
+
+            embedding_stage.add(ids=ids, texts=chunks, metadatas=metadata)
+
+        embedding_stage.flush()
+    finally:
+        embedding_stage.close()
+    if incremental_index is not None:
+        incremental_index.delete_removed_episodes()
+        logger.info(incremental_index.report())
+        print(incremental_index.report())
+    throughput_report: str = embedding_stage.report()
+    logger.info(throughput_report)
+    print(throughput_report)
+
+    logger.info(f"Dropped sentences per rule: {job.boilerplate_filter.drop_counts}")
     logger.info("The full pipeline is completed.")
 
 
@@ -187,9 +774,41 @@ if __name__ == "__main__":
 
     arg_parser = argparse.ArgumentParser(description="Podcast texts chunking")
     arg_parser.add_argument("--run", default=False, action="store_true")
+    arg_parser.add_argument(
+        "--sentence-splitter", default=SENTENCE_SPLITTER, choices=SENTENCE_SPLITTERS, help="Sentence splitter"
+    )
+    arg_parser.add_argument(
+        "--n-process", default=NLP_N_PROCESS, type=int, help="Number of spaCy processes (-1 means all cores)"
+    )
+    arg_parser.add_argument(
+        "--chunking-mode",
+        default=CHUNKING_MODE,
+        choices=CHUNKING_MODES,
+        help="Chunk by words, model tokens or sentences",
+    )
+    arg_parser.add_argument(
+        "--no-embedding-cache", default=False, action="store_true", help="Embed all chunks again"
+    )
+    arg_parser.add_argument(
+        "--upsert", default=False, action="store_true", help="Update the latest vector database incrementally"
+    )
+    arg_parser.add_argument(
+        "--embed-workers", default=EMBED_WORKERS, type=int, help="Number of embedding processes"
+    )
+    arg_parser.add_argument(
+        "--embedding-backend", default=EMBEDDING_BACKEND, choices=EMBEDDING_BACKENDS, help="Embedding backend"
+    )
     args = arg_parser.parse_args()
 
     if args.run:
         logger.info("Starting chunking and saving pipeline")
         # Run the pipeline
-        main()
+        main(
+            sentence_splitter=args.sentence_splitter,
+            nlp_n_process=args.n_process,
+            chunking_mode=args.chunking_mode,
+            use_embedding_cache=not args.no_embedding_cache,
+            upsert=args.upsert,
+            embed_workers=args.embed_workers,
+            embedding_backend=args.embedding_backend,
+        )
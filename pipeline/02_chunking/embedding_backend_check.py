@@ -0,0 +1,134 @@
+"""
+This Python file exports the embedding model to ONNX (fp32 and int8 dynamic-quantised) and checks an
+embedding backend against the fp32 PyTorch model on chunks of the scrapped corpus: recall@k of
+brute-force cosine retrieval, embedding throughput and per-query latency.
+"""
+
+# Import modules and packages
+import time
+import random
+import statistics
+import numpy as np
+from embedding_backends import get_embeddings, export_onnx_model, EMBEDDING_BACKENDS
+from chunk_to_vectordb import (
+    ChunkingAndSaving,
+    CORPUS_PATH,
+    EMBEDDING_MODEL,
+    EMBED_BATCH_SIZE,
+    ONNX_MODEL_DIR,
+)
+
+
+def sample_chunks(path: str, n_episodes: int, seed: int) -> tuple:
+    """
+    Chunk the given number of randomly sampled episodes the same way as the pipeline does. Return the
+    chunks and the queries (one valid sentence of every sampled episode).
+    """
+    job = ChunkingAndSaving(sentence_splitter="regex")
+    records: list = [this_record for this_batch in job.load_corpus(path=path) for this_record in this_batch]
+    rng = random.Random(seed)
+    records = rng.sample(records, min(n_episodes, len(records)))
+
+    chunks: list = []
+    queries: list = []
+    for _, sentences, sentence_spans in job.iter_split_records(records=records):
+        valid_sentences, _, breaks = job.valid_sentences(sentences=sentences, sentence_spans=sentence_spans)
+        if len(valid_sentences) == 0:
+            continue
+        queries.append(rng.choice(valid_sentences))
+        episode_chunks, _ = job.chunk_sentences(sentences=valid_sentences, breaks=breaks)
+        chunks.extend(episode_chunks)
+
+    return chunks, queries
+
+
+def embed_timed(embeddings, texts: list) -> tuple:
+    """
+    Embed texts and return the (rows normalised) embedding matrix and the elapsed seconds
+    """
+    started_at: float = time.perf_counter()
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    elapsed: float = time.perf_counter() - started_at
+
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True), elapsed
+
+
+def top_k(query_vectors, chunk_vectors, k: int):
+    """
+    Indices of the k most similar chunks (cosine) of every query
+    """
+    scores = query_vectors @ chunk_vectors.T
+
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def query_latencies(embeddings, queries: list) -> list[float]:
+    """
+    Latency (milliseconds) of embedding every query on its own
+    """
+    latencies: list[float] = []
+    for this_query in queries:
+        started_at: float = time.perf_counter()
+        embeddings.embed_query(this_query)
+        latencies.append((time.perf_counter() - started_at) * 1000)
+
+    return latencies
+
+
+def main(backend: str, path: str, n_episodes: int, k: int, seed: int) -> None:
+    """
+    Compare the given backend with the fp32 PyTorch model and print the report
+    """
+    chunks, queries = sample_chunks(path=path, n_episodes=n_episodes, seed=seed)
+    if len(chunks) == 0:
+        print(f"No scrapped podcasts found in {path}")
+        return None
+    print(f"Episodes: {len(queries)}, chunks: {len(chunks)}, queries: {len(queries)}, k: {k}")
+
+    results: dict = {}
+    for this_backend in dict.fromkeys(("torch", backend)):
+        embeddings = get_embeddings(
+            backend=this_backend, model_name=EMBEDDING_MODEL, onnx_dir=ONNX_MODEL_DIR, batch_size=EMBED_BATCH_SIZE
+        )
+        chunk_vectors, elapsed = embed_timed(embeddings=embeddings, texts=chunks)
+        query_vectors, _ = embed_timed(embeddings=embeddings, texts=queries)
+        latencies: list[float] = query_latencies(embeddings=embeddings, queries=queries)
+        results[this_backend] = (chunk_vectors, query_vectors)
+        print(
+            f"{this_backend}: {len(chunks) / elapsed:.1f} chunks/s, query latency median "
+            f"{statistics.median(latencies):.2f} ms, max {max(latencies):.2f} ms"
+        )
+
+    reference_chunks, reference_queries = results["torch"]
+    chunk_vectors, query_vectors = results[backend]
+    reference_hits = top_k(query_vectors=reference_queries, chunk_vectors=reference_chunks, k=k)
+    hits = top_k(query_vectors=query_vectors, chunk_vectors=chunk_vectors, k=k)
+    recall: float = statistics.mean(
+        len(set(this_reference) & set(this_hits)) / k for this_reference, this_hits in zip(reference_hits, hits)
+    )
+    cosines = np.sum(reference_chunks * chunk_vectors, axis=1)
+    print(
+        f"{backend} vs torch: recall@{k} {recall:.4f}, chunk embedding cosine mean {cosines.mean():.5f}, "
+        f"min {cosines.min():.5f}"
+    )
+
+    return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Embedding backend export and recall check")
+    arg_parser.add_argument("--export", default=False, action="store_true", help="Export model to ONNX")
+    arg_parser.add_argument("--run", default=False, action="store_true")
+    arg_parser.add_argument("--backend", default="onnx-int8", choices=EMBEDDING_BACKENDS, help="Checked backend")
+    arg_parser.add_argument("--path", default=CORPUS_PATH, help="Corpus with scrapped podcasts")
+    arg_parser.add_argument("--episodes", default=200, type=int, help="Sampled episodes")
+    arg_parser.add_argument("--k", default=5, type=int, help="Retrieved chunks per query")
+    arg_parser.add_argument("--seed", default=0, type=int)
+    args = arg_parser.parse_args()
+
+    if args.export:
+        export_onnx_model(model_name=EMBEDDING_MODEL, onnx_dir=ONNX_MODEL_DIR)
+    if args.run:
+        main(backend=args.backend, path=args.path, n_episodes=args.episodes, k=args.k, seed=args.seed)
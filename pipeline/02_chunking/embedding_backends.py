@@ -0,0 +1,182 @@
+"""
+This Python file provides interchangeable backends of the embedding model: plain PyTorch through
+sentence-transformers or a locally exported ONNX Runtime model (optionally int8 dynamic-quantised)
+for faster CPU inference. All backends follow the langchain Embeddings interface.
+"""
+
+# Import modules and packages
+import os
+import re
+import json
+import logging
+from langchain_core.embeddings import Embeddings
+from langchain.embeddings import SentenceTransformerEmbeddings
+
+logger = logging.getLogger(__name__)
+
+# System constants
+EMBEDDING_BACKENDS: tuple = ("torch", "onnx", "onnx-int8")
+ONNX_FILENAMES: dict = {
+    "onnx": "model.onnx",
+    "onnx-int8": "model.int8.onnx",
+}
+ONNX_META_FILENAME: str = "embedding_meta.json"
+
+
+def get_onnx_model_dir(onnx_dir: str, model_name: str) -> str:
+    """
+    Folder of the exported ONNX version of the given model
+    """
+    return os.path.join(onnx_dir, re.sub(r"[^\w.-]+", "_", model_name))
+
+
+def export_onnx_model(model_name: str, onnx_dir: str) -> str:
+    """
+    Export the sentence-transformers model to ONNX (fp32) and its int8 dynamic-quantised variant,
+    store the tokenizer and pooling settings next to them. Return the export folder.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    model_dir: str = get_onnx_model_dir(onnx_dir=onnx_dir, model_name=model_name)
+    os.makedirs(model_dir, exist_ok=True)
+
+    sentence_model = SentenceTransformer(model_name, device="cpu")
+    transformer = sentence_model[0].auto_model.eval()
+    tokenizer = sentence_model.tokenizer
+    tokenizer.save_pretrained(model_dir)
+
+    class NamedInputsTransformer(torch.nn.Module):
+        """
+        Pass the graph inputs to the transformer by name: the positional order of the tokenizer outputs
+        (input_ids, token_type_ids, attention_mask) differs from the forward() signature of the model
+        """
+
+        def __init__(self, input_names: list):
+            super().__init__()
+            self.transformer = transformer
+            self.input_names: list = input_names
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(self.input_names, inputs))).last_hidden_state
+
+    dummy_input = tokenizer(["An example sentence"], return_tensors="pt")
+    input_names: list = list(dummy_input.keys())
+    dynamic_axes: dict = {this_name: {0: "batch", 1: "sequence"} for this_name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    fp32_path: str = os.path.join(model_dir, ONNX_FILENAMES["onnx"])
+    with torch.no_grad():
+        torch.onnx.export(
+            NamedInputsTransformer(input_names=input_names).eval(),
+            tuple(dummy_input[this_name] for this_name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    quantize_dynamic(
+        fp32_path, os.path.join(model_dir, ONNX_FILENAMES["onnx-int8"]), weight_type=QuantType.QInt8
+    )
+
+    with open(os.path.join(model_dir, ONNX_META_FILENAME), "w", encoding="utf-8") as fh:
+        json.dump(
+            {
+                "input_names": input_names,
+                "max_seq_length": sentence_model.max_seq_length,
+                "normalize": any(isinstance(this_module, Normalize) for this_module in sentence_model),
+            },
+            fh,
+        )
+    logger.info(f"ONNX model is exported to {model_dir}")
+
+    return model_dir
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    Embed texts with the exported ONNX model in ONNX Runtime: mean pooling of token embeddings (and
+    L2 normalisation if the original model normalises), same as the sentence-transformers model
+    """
+
+    def __init__(
+        self, model_dir: str, backend: str = "onnx", batch_size: int = 64, n_threads: int = None
+    ):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, ONNX_META_FILENAME), encoding="utf-8") as fh:
+            meta: dict = json.load(fh)
+        self.input_names: list = meta["input_names"]
+        self.max_seq_length: int = meta["max_seq_length"]
+        self.normalize: bool = meta["normalize"]
+        self.batch_size: int = batch_size
+
+        session_options = onnxruntime.SessionOptions()
+        if n_threads is not None:
+            session_options.intra_op_num_threads = n_threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, ONNX_FILENAMES[backend]),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+    def _embed_batch(self, texts: list) -> list:
+        """
+        Embed a single batch of texts
+        """
+        import numpy as np
+
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_seq_length, return_tensors="np"
+        )
+        token_embeddings = self.session.run(
+            None, {this_name: encoded[this_name].astype(np.int64) for this_name in self.input_names}
+        )[0]
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        vectors = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+        return vectors.tolist()
+
+    def embed_documents(self, texts: list) -> list:
+        """
+        Embed texts in batches (sorted by length, so batches are padded as little as possible)
+        """
+        texts = [this_text.replace("\n", " ") for this_text in texts]
+        order: list = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: list = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch: list = order[start:start + self.batch_size]
+            for i, this_vector in zip(batch, self._embed_batch(texts=[texts[i] for i in batch])):
+                vectors[i] = this_vector
+
+        return vectors
+
+    def embed_query(self, text: str) -> list:
+        """
+        Embed a single query
+        """
+        return self.embed_documents(texts=[text])[0]
+
+
+def get_embeddings(
+    backend: str, model_name: str, onnx_dir: str, batch_size: int = 64, n_threads: int = None
+) -> Embeddings:
+    """
+    Build embeddings of the given backend: "torch" (sentence-transformers), "onnx" (fp32 ONNX Runtime)
+    or "onnx-int8" (int8 dynamic-quantised ONNX Runtime, the model has to be exported first)
+    """
+    if backend == "torch":
+        return SentenceTransformerEmbeddings(model_name=model_name, encode_kwargs={"batch_size": batch_size})
+
+    return OnnxEmbeddings(
+        model_dir=get_onnx_model_dir(onnx_dir=onnx_dir, model_name=model_name),
+        backend=backend,
+        batch_size=batch_size,
+        n_threads=n_threads,
+    )
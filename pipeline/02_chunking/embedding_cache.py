@@ -0,0 +1,125 @@
+"""
+This Python file keeps an on-disk cache of chunk embeddings, so repeated runs of the chunking pipeline
+only embed new or changed chunks
+"""
+
+# Import modules and packages
+import os
+import re
+import json
+import hashlib
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# System constants
+VECTORS_FILENAME: str = "vectors.f32"  # float32 rows, one per cached chunk
+HASHES_FILENAME: str = "hashes.txt"  # "<chunk text hash> <row>" lines
+META_FILENAME: str = "meta.json"
+
+
+def get_chunk_hash(text: str) -> str:
+    """
+    Return SHA-256 hash of the given chunk text
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Append-only cache of embeddings namespaced by the embedding model: vectors are stored as a float32
+    file read through a memory map, a hash -> row index is rebuilt from the hashes file on load
+    """
+
+    def __init__(self, cache_dir: str, model_name: str):
+        self.cache_dir: str = os.path.join(cache_dir, re.sub(r"[^\w.-]+", "_", model_name))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.vectors_path: str = os.path.join(self.cache_dir, VECTORS_FILENAME)
+        self.hashes_path: str = os.path.join(self.cache_dir, HASHES_FILENAME)
+        self.meta_path: str = os.path.join(self.cache_dir, META_FILENAME)
+        self.dim: int = None
+        self.rows: dict = {}
+        self._vectors = None
+        self.load()
+
+    def load(self) -> None:
+        """
+        Load the hash -> row index, rows without a completely written vector are ignored
+        """
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, encoding="utf-8") as fh:
+            self.dim = json.load(fh)["dim"]
+
+        n_vectors: int = self._n_vectors()
+        if os.path.exists(self.hashes_path):
+            with open(self.hashes_path, encoding="utf-8") as fh:
+                for this_line in fh:
+                    this_hash, _, row = this_line.strip().partition(" ")
+                    if row.isdigit() and int(row) < n_vectors:
+                        self.rows[this_hash] = int(row)
+        logger.info(f"Embedding cache is loaded with {len(self.rows)} vectors.")
+
+        return None
+
+    def _n_vectors(self) -> int:
+        """
+        Number of completely written vectors
+        """
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return 0
+
+        return os.path.getsize(self.vectors_path) // (4 * self.dim)
+
+    def _memmap(self):
+        """
+        Memory map of the vectors file covering all written rows (re-mapped when the cache grew)
+        """
+        n_rows: int = self._n_vectors()
+        if self._vectors is None or self._vectors.shape[0] < n_rows:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(n_rows, self.dim))
+
+        return self._vectors
+
+    def get_many(self, texts: list) -> list:
+        """
+        Return cached embedding of every given chunk text (None if the chunk is not cached)
+        """
+        hashes: list = [get_chunk_hash(text=this_text) for this_text in texts]
+        if not any(this_hash in self.rows for this_hash in hashes):
+            return [None] * len(texts)
+
+        vectors = self._memmap()
+
+        return [
+            vectors[self.rows[this_hash]].tolist() if this_hash in self.rows else None
+            for this_hash in hashes
+        ]
+
+    def put_many(self, texts: list, vectors: list) -> None:
+        """
+        Append embeddings of the given chunk texts to the cache
+        """
+        if len(texts) == 0:
+            return None
+
+        array = np.asarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = int(array.shape[1])
+            with open(self.meta_path, "w", encoding="utf-8") as fh:
+                json.dump({"dim": self.dim}, fh)
+
+        hashes: list = [get_chunk_hash(text=this_text) for this_text in texts]
+        n_rows: int = self._n_vectors()
+        # Vectors are written before hashes, so an interrupted write never indexes a missing vector,
+        # a partially written vector of an interrupted write is cut off
+        with open(self.vectors_path, "ab") as fh:
+            fh.truncate(n_rows * 4 * self.dim)
+            fh.write(array.tobytes())
+        with open(self.hashes_path, "a", encoding="utf-8") as fh:
+            fh.write("".join(f"{this_hash} {row}\n" for row, this_hash in enumerate(hashes, start=n_rows)))
+        for row, this_hash in enumerate(hashes, start=n_rows):
+            self.rows[this_hash] = row
+
+        return None
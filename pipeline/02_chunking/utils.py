@@ -7,30 +7,85 @@ from datetime import datetime
 import os
 import re
 import json
+import hashlib
+import itertools
 
 
-def get_file_list(root_dir, E):
+def read_jsonl_batches(path: str, batch_size: int):
     """
-    Get all files with given extenstion in a root folder
+    Read JSON Lines file sequentially and yield its records in batches of the given size
     """
-    file_list = []
+    batch: list[dict] = []
+    with open(path, encoding="utf-8") as fh:
+        for this_line in fh:
+            if this_line.strip():
+                batch.append(json.loads(this_line))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+
+    if len(batch) > 0:
+        yield batch
 
-    for root, directories, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if any(ext in filename for ext in E) and not filename.endswith(".DS_Store"):
-                file_list.append(os.path.join(root, filename))
 
-    return file_list
+# Sentence boundary of the regex sentence splitter: whitespace after sentence-final punctuation
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+")
 
 
-def read_single_json(path: str) -> dict:
+def split_sentence_spans(text: str) -> list:
     """
-    Read a single JSON file from given path
+    Lightweight regex alternative of the spaCy sentencizer: split the given text into sentences after
+    sentence-final punctuation and return (start, end) character offsets of the sentences in the text
     """
-    with open(path, encoding="utf-8") as fh:
-        json_data = json.load(fh)
+    sentence_spans: list = []
+    start: int = 0
+    for boundary in itertools.chain(SENTENCE_BOUNDARY_PATTERN.finditer(text), [None]):
+        end: int = len(text) if boundary is None else boundary.start()
+        sentence: str = text[start:end]
+        stripped: str = sentence.strip()
+        if stripped:
+            this_start: int = start + len(sentence) - len(sentence.lstrip())
+            sentence_spans.append((this_start, this_start + len(stripped)))
+        if boundary is not None:
+            start = boundary.end()
+
+    return sentence_spans
+
+
+def split_sentences(text: str) -> list:
+    """
+    Split the given text into sentences with the regex sentence splitter
+    """
+    return [text[start:end] for start, end in split_sentence_spans(text=text)]
+
+
+def get_normalised_text_hash(text: str) -> str:
+    """
+    Hash of the given text ignoring case, punctuation and whitespace, so the same episode scrapped
+    from different URLs gets the same hash
+    """
+    normalised_text: str = " ".join(re.findall(r"\w+", text.lower()))
+
+    return hashlib.sha256(normalised_text.encode("utf-8")).hexdigest()
+
+
+def get_url_preference(url: str) -> tuple:
+    """
+    Sort key of mirrored episode URLs: numbered sds- URLs go first, ties are broken by the URL itself,
+    so the same URL of an episode is kept in every run
+    """
+    return ("sds-" not in url, url)
 
-    return json_data
+
+def get_chunk_id(url: str, index: int, text: str) -> str:
+    """
+    Deterministic ID of the chunk made of the episode URL, position of the chunk in the episode and
+    the chunk text, so an unchanged chunk gets the same ID in every run
+    """
+    url_hash: str = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    text_hash: str = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    return f"{url_hash}-{index:05d}-{text_hash}"
 
 
 def preprocess_chunk(chunk: str) -> str:
@@ -64,50 +119,202 @@ def preprocess_sentence(sentence: str) -> str:
     return sentence
 
 
-def valid_sentence(sentence: str, allowed_sentence_lenght: int) -> bool:
+TOO_SHORT_RULE: str = "too short"  # drop count key of sentences which are not long enough
+
+
+class BoilerplateFilter:
     """
-    Check if the given sentence is valid to push it to vector database
+    Drop boilerplate sentences (containing any of the given phrases, case insensitive) and sentences
+    which are not longer than min_sentence_length. Phrases are compiled into one pattern, so a sentence
+    is lowercased once and scanned once. Drop counts per rule are accumulated in self.drop_counts.
     """
 
-    CONDS = [
-        "Data Science Coach and Lifestyle Entrepreneur".lower() not in sentence.lower(),
-        "Welcome to the Super Data Science Podcast".lower() not in sentence.lower(),
-        "look forward to seeing you".lower() not in sentence.lower(),
-        "happy analyzing".lower() not in sentence.lower(),
-        "This is Five-Minute Friday on".lower() not in sentence.lower(),
-        "I was really excited".lower() not in sentence.lower(),
-        "see you back here next time".lower() not in sentence.lower(),
-        len(sentence) > allowed_sentence_lenght,
-    ]
+    def __init__(self, phrases: list, min_sentence_length: int):
+        self.phrases: dict = {this_phrase.lower(): this_phrase for this_phrase in phrases}
+        self.min_sentence_length: int = min_sentence_length
+        self.pattern = re.compile("|".join(re.escape(this_phrase) for this_phrase in self.phrases))
+        self.drop_counts: dict = dict.fromkeys([*self.phrases.values(), TOO_SHORT_RULE], 0)
 
-    if all(CONDS):
-        return True
-    else:
-        return False
+    def match_rule(self, sentence: str) -> str:
+        """
+        Return the rule (phrase or TOO_SHORT_RULE) which drops the given sentence, None if it is kept
+        """
+        if len(self.phrases) > 0:
+            found_phrase = self.pattern.search(sentence.lower())
+            if found_phrase is not None:
+                return self.phrases[found_phrase.group()]
+        if len(sentence) <= self.min_sentence_length:
+            return TOO_SHORT_RULE
 
+        return None
 
-def split_text(text: str, chunk_overlap: int, chunk_size: int) -> list:
+    def keep_mask(self, sentences: list) -> tuple:
+        """
+        Return keep flag of every sentence and drop counts per rule of the given batch of sentences
+        """
+        mask: list = []
+        drop_counts: dict = {}
+        for this_sentence in sentences:
+            rule: str = self.match_rule(sentence=this_sentence)
+            mask.append(rule is None)
+            if rule is not None:
+                drop_counts[rule] = drop_counts.get(rule, 0) + 1
+                self.drop_counts[rule] += 1
+
+        return mask, drop_counts
+
+    def filter(self, sentences: list) -> tuple:
+        """
+        Return kept sentences and drop counts per rule of the given batch of sentences
+        """
+        mask, drop_counts = self.keep_mask(sentences=sentences)
+
+        return [this_sentence for this_sentence, keep in zip(sentences, mask) if keep], drop_counts
+
+
+def iter_chunks(tokens, chunk_overlap: int, chunk_size: int):
     """
-    Splitting given text into smaller chunks
+    Split given stream of tokens (words) into chunks of chunk_size tokens, every chunk repeats the last
+    chunk_overlap tokens of the previous one. Chunks are yielded as soon as they are complete, the last
+    chunk is yielded only if it holds tokens which are not in the previous chunk.
     """
-    tokens: list = text.split()
-    splits: list = []
     temp_list: list = []
-    cursor: int = 0
+    n_new_tokens: int = 0
 
-    while cursor < len(tokens):
-        temp_list.append(tokens[cursor])
+    for this_token in tokens:
+        temp_list.append(this_token)
+        n_new_tokens += 1
 
         if len(temp_list) == chunk_size:
-            cursor -= chunk_overlap
-            splits.append(" ".join(temp_list))
-            temp_list = []
+            yield " ".join(temp_list)
+            temp_list = temp_list[chunk_size - chunk_overlap:]
+            n_new_tokens = 0
+
+    if n_new_tokens > 0:
+        yield " ".join(temp_list)
+
+
+def _word_start(word_ids: list, position: int, lower_bound: int) -> int:
+    """
+    Move the given token position back to the first token of its word, but not below lower_bound
+    """
+    while position > lower_bound and word_ids[position] == word_ids[position - 1]:
+        position -= 1
+
+    return position
+
+
+class TokenChunker:
+    """
+    Split texts into chunks of at most chunk_size tokens of the embedding model tokenizer, every chunk
+    repeats about chunk_overlap tokens of the previous one. Chunks are cut at word boundaries (a word
+    longer than chunk_size is the only exception), so a chunk is tokenized into the same tokens again
+    at embed time and is never truncated.
+    """
+
+    def __init__(self, model_name: str, chunk_size: int, chunk_overlap: int):
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        self.chunk_size: int = chunk_size
+        self.chunk_overlap: int = chunk_overlap
+
+    def split_texts(self, texts: list) -> list:
+        """
+        Encode the given texts in one batch and return list of chunks of every text
+        """
+        encodings = self.tokenizer(texts, add_special_tokens=False, return_offsets_mapping=True)
+        all_chunks: list = []
+        for i, this_text in enumerate(texts):
+            offsets: list = encodings["offset_mapping"][i]
+            word_ids: list = encodings.word_ids(i)
+            n_tokens: int = len(offsets)
+            chunks: list = []
+            start: int = 0
+
+            while start < n_tokens:
+                end: int = min(start + self.chunk_size, n_tokens)
+                if end < n_tokens:
+                    cut: int = _word_start(word_ids=word_ids, position=end, lower_bound=start + 1)
+                    if word_ids[cut] != word_ids[cut - 1]:
+                        end = cut
+                chunks.append(this_text[offsets[start][0]:offsets[end - 1][1]])
+                if end == n_tokens:
+                    break
+
+                start = _word_start(
+                    word_ids=word_ids, position=max(end - self.chunk_overlap, start + 1), lower_bound=start + 1
+                )
+
+            all_chunks.append(chunks)
+
+        return all_chunks
+
+
+def pack_sentences(sentence_sizes: list, chunk_size: int, sentence_overlap: int, breaks: set = None) -> list:
+    """
+    Pack whole sentences into chunks of at most chunk_size (sum of sentence sizes), every chunk repeats
+    the last sentence_overlap sentences of the previous one. A sentence larger than chunk_size makes its
+    own chunk. A chunk never continues over a break (position of a sentence which has to start a new
+    chunk) and the chunk after a break does not repeat sentences before it. Chunks are returned as
+    (first, last) indices of their sentences.
+    """
+    breaks: set = breaks or set()
+    sentence_ranges: list = []
+    first: int = 0
+
+    while first < len(sentence_sizes):
+        last: int = first
+        size: int = sentence_sizes[first]
+        while (
+            last + 1 < len(sentence_sizes)
+            and last + 1 not in breaks
+            and size + sentence_sizes[last + 1] <= chunk_size
+        ):
+            last += 1
+            size += sentence_sizes[last]
+
+        sentence_ranges.append((first, last))
+        if last == len(sentence_sizes) - 1:
+            break
+        if last + 1 in breaks:
+            first = last + 1
+        else:
+            first = max(last + 1 - sentence_overlap, first + 1)
+
+    return sentence_ranges
+
 
-        cursor += 1
+def split_text(text: str, chunk_overlap: int, chunk_size: int) -> list:
+    """
+    Splitting given text into smaller chunks
+    """
+    return list(iter_chunks(tokens=text.split(), chunk_overlap=chunk_overlap, chunk_size=chunk_size))
 
-    splits.append(" ".join(temp_list))
 
-    return splits
+def get_database_mtime(db_path: str) -> float:
+    """
+    Last modification time of the vector database: the latest of the folder and its entries (files
+    updated in place, e.g. chroma.sqlite3, do not touch the folder itself)
+    """
+    with os.scandir(db_path) as entries:
+        return max([os.path.getmtime(db_path), *(this_entry.stat().st_mtime for this_entry in entries)])
+
+
+def find_latest_database(db_dir: str) -> str:
+    """
+    Path of the most recently modified vector database (db_* folder) in the given folder, None if there
+    is none. Shared by the chunking (upsert mode) and retrieval pipelines.
+    """
+    if not os.path.isdir(db_dir):
+        return None
+    databases: list = [
+        os.path.join(db_dir, this_name)
+        for this_name in os.listdir(db_dir)
+        if this_name.startswith("db_") and os.path.isdir(os.path.join(db_dir, this_name))
+    ]
+
+    return max(databases, key=get_database_mtime, default=None)
 
 
 def get_current_date_and_time() -> str:
@@ -0,0 +1,197 @@
+"""
+This Python file runs a long-lived local retrieval service: the embedding model and the latest vector
+database are loaded once at startup and every request only embeds its query and searches the database.
+Requests are answered concurrently (one thread per request).
+
+GET  /search?query=<text>&where=<source>&k=<n>
+POST /search with JSON body {"query": <text>, "where": <source>, "k": <n>}
+POST /search_batch with JSON body {"queries": [<text>, ...], "where": <source>, "k": <n>}
+GET  /health
+"""
+
+# Import modules and packages
+import json
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from retrieve_from_vectordb import RetrieveFromDB, conf, logger
+
+# System constants (from config file)
+SERVICE_HOST: str = conf["retrieval"]["SERVICE_HOST"]
+SERVICE_PORT: int = int(conf["retrieval"]["SERVICE_PORT"])
+SERVICE_MAX_K: int = int(conf["retrieval"]["SERVICE_MAX_K"])  # most chunks returned per request
+DEFAULT_K: int = 5
+MAX_BODY_SIZE: int = 1024 * 1024  # bytes of a POST request body
+
+
+class RetrievalServer(ThreadingHTTPServer):
+    """
+    HTTP server holding the warm retrieval job shared by all request threads
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple, retriever: RetrieveFromDB):
+        super().__init__(address, RetrievalRequestHandler)
+        self.retriever: RetrieveFromDB = retriever
+        self.database = retriever.connect()
+
+
+class RetrievalRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answer search requests with the best chunks and their scores
+    """
+
+    def _send_json(self, status: int, body: dict) -> None:
+        """
+        Send JSON response
+        """
+        payload: bytes = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        return None
+
+    def _get_k(self, params: dict) -> int:
+        """
+        Number of chunks to return, None (and error response sent) if it is not valid. Only integers
+        are accepted: JSON true or 2.9 is not silently turned into 1 or 2.
+        """
+        k = params.get("k", DEFAULT_K)
+        if not isinstance(k, int) or isinstance(k, bool):
+            self._send_json(400, {"error": "k must be an integer"})
+            return None
+        if not 1 <= k <= SERVICE_MAX_K:
+            self._send_json(400, {"error": f"k must be between 1 and {SERVICE_MAX_K}"})
+            return None
+
+        return k
+
+    def _search(self, params: dict) -> None:
+        """
+        Validate request parameters, run the search and send the results
+        """
+        query: str = params.get("query")
+        if not isinstance(query, str) or not query.strip():
+            return self._send_json(400, {"error": "query is required"})
+        where: str = params.get("where") or None
+        k: int = self._get_k(params=params)
+        if k is None:
+            return None
+
+        started_at: float = time.perf_counter()
+        try:
+            l_data: list = self.server.retriever.get_top_results_and_scores(
+                query=query, database=self.server.database, where=where, n_resurces_to_return=k
+            )
+        except Exception as e:
+            logger.exception(f"Search of {query!r} failed")
+            return self._send_json(500, {"error": str(e)})
+        elapsed_ms: float = (time.perf_counter() - started_at) * 1000
+        logger.info(f"Search of {query!r} (where={where}, k={k}) took {elapsed_ms:.1f} ms")
+
+        return self._send_json(200, {"results": l_data, "elapsed_ms": round(elapsed_ms, 2)})
+
+    def _search_batch(self, params: dict) -> None:
+        """
+        Validate request parameters, run the batch search and send per-query results
+        """
+        queries: list = params.get("queries")
+        if (
+            not isinstance(queries, list)
+            or len(queries) == 0
+            or not all(isinstance(this_query, str) and this_query.strip() for this_query in queries)
+        ):
+            return self._send_json(400, {"error": "queries must be a non-empty list of texts"})
+        where: str = params.get("where") or None
+        k: int = self._get_k(params=params)
+        if k is None:
+            return None
+
+        started_at: float = time.perf_counter()
+        try:
+            l_batch: list = self.server.retriever.get_top_results_and_scores_batch(
+                queries=queries, where=where, n_resurces_to_return=k
+            )
+        except Exception as e:
+            logger.exception(f"Batch search of {len(queries)} queries failed")
+            return self._send_json(500, {"error": str(e)})
+        elapsed_ms: float = (time.perf_counter() - started_at) * 1000
+        logger.info(f"Batch search of {len(queries)} queries (where={where}, k={k}) took {elapsed_ms:.1f} ms")
+
+        return self._send_json(200, {"results": l_batch, "elapsed_ms": round(elapsed_ms, 2)})
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/health":
+            return self._send_json(200, {"status": "ok"})
+        if url.path == "/search":
+            params: dict = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            # Query string values are texts, k is converted only if it is written as a plain integer
+            if params.get("k", "").isdecimal():
+                params["k"] = int(params["k"])
+            return self._search(params=params)
+
+        return self._send_json(404, {"error": f"unknown path {url.path}"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path not in ("/search", "/search_batch"):
+            return self._send_json(404, {"error": f"unknown path {url.path}"})
+        try:
+            length: int = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            return self._send_json(400, {"error": "Content-Length must be an integer"})
+        # read() of a negative length would block till the client closes the connection
+        if not 0 <= length <= MAX_BODY_SIZE:
+            return self._send_json(400, {"error": f"Content-Length must be between 0 and {MAX_BODY_SIZE}"})
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._send_json(400, {"error": "body must be JSON"})
+        if not isinstance(params, dict):
+            return self._send_json(400, {"error": "body must be a JSON object"})
+
+        if url.path == "/search_batch":
+            return self._search_batch(params=params)
+
+        return self._search(params=params)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info(f"{self.address_string()} {format % args}")
+
+
+def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> None:
+    """
+    Load the embedding model and the latest vector database, then answer requests until interrupted
+    """
+    started_at: float = time.perf_counter()
+    server = RetrievalServer(address=(host, port), retriever=RetrieveFromDB())
+    # First query pays one-off model initialisation, do it before accepting requests
+    server.database.embeddings.embed_query("warm up")
+    logger.info(f"Retrieval service is ready on {host}:{port} in {time.perf_counter() - started_at:.1f} s")
+    print(f"Retrieval service is listening on http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info("Retrieval service is stopped.")
+
+    return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Retrieval service")
+    arg_parser.add_argument("--host", default=SERVICE_HOST, help="Host to listen on")
+    arg_parser.add_argument("--port", default=SERVICE_PORT, type=int, help="Port to listen on")
+    args = arg_parser.parse_args()
+
+    serve(host=args.host, port=args.port)
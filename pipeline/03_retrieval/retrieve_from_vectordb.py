@@ -5,16 +5,19 @@ pre-generated vector database (ChromaDB)
 
 # Import modules and packages
 import os
-import time
+import sys
+import math
 import logging
-import datetime
 import configparser
 import chromadb
-from glob import glob
 from dotenv import load_dotenv
 import chromadb.utils.embedding_functions as embedding_functions
 from langchain_community.vectorstores import Chroma
-from langchain.embeddings import SentenceTransformerEmbeddings
+
+# Embedding backends are shared with the chunking pipeline (02 part)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "02_chunking"))
+from embedding_backends import get_embeddings  # noqa: E402
+from utils import find_latest_database  # noqa: E402
 
 
 # Initialize logger
@@ -41,6 +44,45 @@ conf.read(os.path.join(conf_dir, "config.conf"))
 DATABASE_NAME: str = None  # The most recent vector database found on 02 part
 EMBEDDING_FUNCTION: str = conf["llm_parameters"]["EMBEDDING_FUNCTION"]
 EMBEDDING_MODEL: str = conf["llm_parameters"]["EMBEDDING_MODEL"]
+EMBEDDING_BACKEND: str = conf["embedding"]["EMBEDDING_BACKEND"]  # torch, onnx or onnx-int8
+ONNX_MODEL_DIR: str = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", conf["embedding"]["ONNX_MODEL_DIR"])
+)
+COLLECTION_NAME: str = "langchain"  # collection written by the chunking pipeline (02 part)
+DEFAULT_DISTANCE: str = "l2"  # ChromaDB distance of collections without "hnsw:space" metadata
+
+
+def l2_distance_to_score(distance: float) -> float:
+    """
+    Relevance score of the euclidean (l2) distance
+    """
+    return 1.0 - distance / math.sqrt(2)
+
+
+def cosine_distance_to_score(distance: float) -> float:
+    """
+    Relevance score of the cosine distance
+    """
+    return 1.0 - distance
+
+
+def ip_distance_to_score(distance: float) -> float:
+    """
+    Relevance score of the inner product distance (1 - inner product)
+    """
+    if distance > 0:
+        return 1.0 - distance
+
+    return -1.0 * distance
+
+
+# Distance -> relevance score conversion per ChromaDB distance metric ("hnsw:space"), the same scores as
+# similarity_search_with_relevance_scores of get_top_results_and_scores
+DISTANCE_TO_SCORE: dict = {
+    "l2": l2_distance_to_score,
+    "cosine": cosine_distance_to_score,
+    "ip": ip_distance_to_score,
+}
 
 
 class RetrieveFromDB:
@@ -53,30 +95,22 @@ class RetrieveFromDB:
         self,
         embedding_function: str = EMBEDDING_FUNCTION,
         embedding_model: str = EMBEDDING_MODEL,
+        embedding_backend: str = EMBEDDING_BACKEND,
     ):
         self.embedding_function: str = embedding_function
         self.embedding_model: str = embedding_model
+        self.embedding_backend: str = embedding_backend
+        self.database: Chroma = None
+        self.collection = None  # ChromaDB collection of the database, used by batch queries
 
-    def get_latest_vector_db_path(self, dir_path: str) -> None:
+    def get_latest_vector_db_path(self, dir_path: str) -> str:
         """
         We need to take the latest generated vector database from <02> part and use
-        this database to retrieve scores
+        this database to retrieve scores (the same one the chunking pipeline updates)
         """
-        directory_list_dict = {}
-        directories = glob(f"{dir_path}/*")
-        date_list: list = []
-        for d in directories:
-            latest_file_key = max(glob(f"{d}/*"), key=os.path.getctime)
-            file_arr_time = time.strftime(
-                "%m/%d/%Y", time.gmtime(os.path.getmtime(latest_file_key))
-            )
-            date_val = datetime.datetime.strptime(file_arr_time, "%m/%d/%Y")
-            directory_list_dict[date_val] = latest_file_key
-            date_list.append(date_val)
-
-        max_date = max(date_list)
-        latest_file = directory_list_dict[max_date]
-        latest_directory = latest_file.rsplit("/", 1)[0]
+        latest_directory: str = find_latest_database(db_dir=dir_path)
+        if latest_directory is None:
+            raise FileNotFoundError(f"No vector database found in {dir_path}")
 
         return latest_directory
 
@@ -84,8 +118,10 @@ class RetrieveFromDB:
         """
         Load embedding model used to embedd scrapped text to numerical expression
         """
-        embedding = SentenceTransformerEmbeddings(model_name=self.embedding_model)
-        logger.info("Embedding model is loaded.")
+        embedding = get_embeddings(
+            backend=self.embedding_backend, model_name=self.embedding_model, onnx_dir=ONNX_MODEL_DIR
+        )
+        logger.info(f"Embedding model is loaded ({self.embedding_backend} backend).")
 
         return embedding
 
@@ -93,14 +129,15 @@ class RetrieveFromDB:
         self,
         query: str,
         database: Chroma,
-        where: str,
+        where: str = None,
         n_resurces_to_return: int = 5,
     ) -> list:
         """
-        Finds relevant passages given a query and prints them out with their scores
+        Finds relevant passages given a query and prints them out with their scores (only passages of
+        the given source if where is set)
         """
         similar_docs = database.similarity_search_with_relevance_scores(
-            query=query, k=n_resurces_to_return, filter={"source": where}
+            query=query, k=n_resurces_to_return, filter={"source": where} if where else None
         )
 
         l_data: list = []
@@ -110,15 +147,67 @@ class RetrieveFromDB:
                 "response": this_response[0].dict()["page_content"],
                 "score": this_response[1],
                 "source": this_response[0].dict()["metadata"]["source"],
+                # Source passage of the chunk in the scrapped record (sentences chunking mode only)
+                "url": this_response[0].dict()["metadata"].get("url"),
+                "start": this_response[0].dict()["metadata"].get("start"),
+                "end": this_response[0].dict()["metadata"].get("end"),
             }
             l_data.append(dict(d))
 
         return l_data
 
-    def run_retrieval(self) -> dict:
+    def get_top_results_and_scores_batch(
+        self,
+        queries: list,
+        where: str = None,
+        n_resurces_to_return: int = 5,
+    ) -> list:
         """
-        Trigger the retrieval job and return the most corresponsive chunk(s)
+        Finds relevant passages of every given query in the vector database opened by connect(): all
+        queries are embedded in one model call and searched with one nearest-neighbour query of its
+        collection. Returns per-query result lists of the same shape as get_top_results_and_scores.
+        """
+        if len(queries) == 0:
+            return []
+
+        database: Chroma = self.connect()
+        query_embeddings: list = database.embeddings.embed_documents(list(queries))
+        results: dict = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_resurces_to_return,
+            where={"source": where} if where else None,
+            include=["documents", "metadatas", "distances"],
+        )
+        relevance_score_fn = DISTANCE_TO_SCORE[
+            (self.collection.metadata or {}).get("hnsw:space", DEFAULT_DISTANCE)
+        ]
+
+        l_batch: list = []
+        for documents, metadatas, distances in zip(
+            results["documents"], results["metadatas"], results["distances"]
+        ):
+            l_data: list = [
+                {
+                    "response": this_document,
+                    "score": relevance_score_fn(this_distance),
+                    "source": this_metadata["source"],
+                    "url": this_metadata.get("url"),
+                    "start": this_metadata.get("start"),
+                    "end": this_metadata.get("end"),
+                }
+                for this_document, this_metadata, this_distance in zip(documents, metadatas, distances)
+            ]
+            l_batch.append(l_data)
+
+        return l_batch
+
+    def connect(self) -> Chroma:
         """
+        Load the embedding model and open the latest vector database once, later calls reuse them. The
+        database is opened through own ChromaDB client, which is shared with the langchain Chroma.
+        """
+        if self.database is not None:
+            return self.database
 
         db_dir: str = os.path.abspath(
             os.path.join(
@@ -130,16 +219,26 @@ class RetrieveFromDB:
         latest_db: str = self.get_latest_vector_db_path(dir_path=db_dir)
 
         # Initialize new connection to the latest vector database
+        client = chromadb.PersistentClient(path=os.path.join(db_dir, latest_db))
+        self.collection = client.get_collection(name=COLLECTION_NAME)
         embeddings = self.get_embedding_model()
         db_connection = Chroma(
-            persist_directory=os.path.join(db_dir, latest_db),
+            client=client,
+            collection_name=COLLECTION_NAME,
             embedding_function=embeddings,
         )
         logger.info("Connection to existing vector database is initialized.")
+        self.database = db_connection
+
+        return self.database
 
+    def run_retrieval(self) -> dict:
+        """
+        Trigger the retrieval job and return the most corresponsive chunk(s)
+        """
         l_data: list = self.get_top_results_and_scores(
             query="cybersecurity",
-            database=db_connection,
+            database=self.connect(),
             where="daily-habit-number-six-write-morning-pages",
             n_resurces_to_return=5,
         )